@@ -0,0 +1,80 @@
+"""
+认证中间件吞吐量基准测试：BaseHTTPMiddleware 版本 vs 纯ASGI版本。
+
+直接调用ASGI应用，不经过网络，测量公开路由和无token拒绝两条路径的每秒请求数。
+
+    poetry run python -m scripts.bench_auth_middleware
+"""
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+
+from src.core.auth_middleware import AuthMiddleware, public
+from src.core.interfaces.response import response
+
+LEGACY_PUBLIC = ["/docs", "/redoc", "/user/token", "/openapi.json", "/user/login", "/user/register", "/user/refresh"]
+
+
+async def legacy_auth_middleware(request: Request, call_next):
+    """改造前的中间件：线性查找公开路径，通过 BaseHTTPMiddleware 注册。"""
+    if request.url.path in LEGACY_PUBLIC:
+        return await call_next(request)
+    if not request.headers.get("Authorization"):
+        return response(code=404, message="认证要求, 无token！")
+    return await call_next(request)
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/user/login")
+    @public
+    async def login():
+        return {"ok": True}
+
+    @app.get("/user/userInfo")
+    async def user_info():
+        return {"ok": True}
+
+    if legacy:
+        app.middleware("http")(legacy_auth_middleware)
+    else:
+        app.add_middleware(AuthMiddleware)
+    return app
+
+
+async def call(app, method: str, path: str):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def bench(app, method: str, path: str, rounds: int) -> float:
+    await call(app, method, path)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await call(app, method, path)
+    return rounds / (time.perf_counter() - start)
+
+
+async def main(rounds: int = 5_000):
+    for label, legacy in (("BaseHTTPMiddleware", True), ("纯ASGI", False)):
+        app = build_app(legacy)
+        public_rps = await bench(app, "POST", "/user/login", rounds)
+        reject_rps = await bench(app, "GET", "/user/userInfo", rounds)
+        print(f"{label}: 公开路由 {public_rps:.0f} req/s, 无token拒绝 {reject_rps:.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""
+UserService 依赖解析开销的微基准测试。
+
+对比两种方式构建 UserService 依赖的耗时：
+- before: 每个请求新建 BcryptPasswordManager / JWTTokenManager（原 Depends(BcryptPasswordManager) 的行为）
+- after:  通过 container 提供的进程级单例
+
+    poetry run python -m scripts.bench_di
+"""
+import asyncio
+import time
+
+from src.core.container import container
+from src.core.jwt import JWTTokenManager
+from src.core.security import AsyncPasswordManager, BcryptPasswordManager
+from src.modules.user.user_service import UserService
+
+
+def build_per_request():
+    return UserService(AsyncPasswordManager(BcryptPasswordManager()), JWTTokenManager())
+
+
+async def build_from_container():
+    return UserService(
+        await container.async_password_manager.dependency(),
+        await container.token_manager.dependency(),
+    )
+
+
+async def main(rounds: int = 10_000):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        build_per_request()
+    before = (time.perf_counter() - start) / rounds * 1e6
+
+    await build_from_container()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await build_from_container()
+    after = (time.perf_counter() - start) / rounds * 1e6
+
+    print(f"每请求新建: {before:.2f} us/次")
+    print(f"容器单例:   {after:.2f} us/次")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+批量新增基准测试：一次性 bulk_create vs DbHelper.inserts 分批流式写入，记录峰值内存。
+
+峰值RSS是进程级指标，两种方式需分开运行：
+
+    poetry run python -m scripts.bench_inserts --mode stream --rows 1000000
+    poetry run python -m scripts.bench_inserts --mode legacy --rows 1000000
+"""
+import argparse
+import asyncio
+import os
+import resource
+import tempfile
+import time
+
+from tortoise import Tortoise, fields
+
+from src.common.models import TABLE_INDEXES, Table
+from src.core.dbhelper import DbHelper
+
+
+class Record(Table):
+    name = fields.CharField(max_length=64)
+    value = fields.IntField()
+
+    class Meta:
+        table = "bench_record"
+        indexes = TABLE_INDEXES
+
+
+def generate(rows: int):
+    for i in range(rows):
+        yield {"name": f"name{i}", "value": i}
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["stream", "legacy"], default="stream")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["__main__"]})
+    await Tortoise.generate_schemas()
+
+    start = time.perf_counter()
+    if args.mode == "stream":
+        stats = await DbHelper(Record).inserts(generate(args.rows), batch_size=args.batch_size)
+        print(f"批次数: {len(stats)}, 最慢批次: {max(s['elapsed'] for s in stats) * 1000:.1f} ms")
+    else:
+        await Record.bulk_create([Record(**obj) for obj in generate(args.rows)])
+    elapsed = time.perf_counter() - start
+
+    # Linux 下 ru_maxrss 单位为 KB
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"模式: {args.mode}, 行数: {await Record.all().count()}, 耗时: {elapsed:.2f}s, 峰值RSS: {peak_mb:.1f} MB")
+
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
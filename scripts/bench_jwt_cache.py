@@ -0,0 +1,26 @@
+"""
+JWT 校验微基准测试：完整解码 vs 已验证令牌缓存命中。
+
+    poetry run python -m scripts.bench_jwt_cache
+"""
+import timeit
+
+from src.core.jwt import JWTTokenManager
+from src.utils.cache import TTLCache
+
+
+def main(rounds: int = 20_000):
+    cold = JWTTokenManager()
+    cached = JWTTokenManager(token_cache=TTLCache(maxsize=10_000, ttl=300))
+    token = cold.create_access_token({"sub": "admin"})
+    cached.verify_token(token)
+
+    cold_us = timeit.timeit(lambda: cold.verify_token(token), number=rounds) / rounds * 1e6
+    cached_us = timeit.timeit(lambda: cached.verify_token(token), number=rounds) / rounds * 1e6
+    print(f"完整解码: {cold_us:.2f} us/次")
+    print(f"缓存命中: {cached_us:.2f} us/次")
+    print(f"缓存统计: {cached.token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+日志对请求延迟的影响：关闭日志 / 队列异步日志 / 同步 RotatingFileHandler。
+
+以 log_api_call 装饰的空协程模拟接口，统计每次调用在事件循环线程上的耗时。
+
+    poetry run python -m scripts.bench_logging
+"""
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+from src.core.log import log_api_call
+from src.core.log_config import api_logger, setup_logging
+
+
+@log_api_call
+async def endpoint():
+    return None
+
+
+async def measure(rounds: int) -> list:
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await endpoint()
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return sorted(latencies)
+
+
+def report(label: str, latencies: list):
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label}: p50 {statistics.median(latencies):.1f} us, p99 {p99:.1f} us")
+
+
+async def main(rounds: int = 20_000):
+    setup_logging()
+    queue_handlers = list(api_logger.handlers)
+
+    api_logger.disabled = True
+    report("关闭日志", await measure(rounds))
+    api_logger.disabled = False
+
+    report("队列异步日志", await measure(rounds))
+
+    sync_handler = RotatingFileHandler(
+        os.path.join(tempfile.mkdtemp(), "api.log"), maxBytes=1024 * 1024, backupCount=5
+    )
+    sync_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    api_logger.handlers = [sync_handler]
+    report("同步文件日志", await measure(rounds))
+    api_logger.handlers = queue_handlers
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+登录压测期间 /user/userInfo 的延迟基准测试。
+
+先启动服务并准备好测试账号：
+    poetry run uvicorn src.main:app
+    poetry run python -m scripts.bench_login_burst --base-url http://127.0.0.1:8000 --username admin --password 123456
+
+脚本用多个线程持续请求 /user/login，同时串行请求 /user/userInfo 并统计 p50/p99 延迟。
+分别在改动前后运行，对比 bcrypt 是否仍阻塞事件循环。
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def login(base_url: str, username: str, password: str) -> dict:
+    resp = requests.post(f"{base_url}/user/login", data={"username": username, "password": password})
+    return resp.json()
+
+
+def hammer_login(base_url: str, username: str, password: str, stop: threading.Event):
+    session = requests.Session()
+    while not stop.is_set():
+        session.post(f"{base_url}/user/login", data={"username": username, "password": password})
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="123456")
+    parser.add_argument("--login-threads", type=int, default=16, help="并发登录线程数")
+    parser.add_argument("--requests", type=int, default=500, help="userInfo 请求次数")
+    args = parser.parse_args()
+
+    token = login(args.base_url, args.username, args.password)["data"]["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    session = requests.Session()
+
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=args.login_threads) as pool:
+        for _ in range(args.login_threads):
+            pool.submit(hammer_login, args.base_url, args.username, args.password, stop)
+
+        latencies = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            session.get(f"{args.base_url}/user/userInfo", headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+        stop.set()
+
+    print(f"userInfo 请求数: {len(latencies)}, 登录线程: {args.login_threads}")
+    print(f"p50: {statistics.median(latencies):.2f} ms")
+    print(f"p99: {percentile(latencies, 99):.2f} ms")
+    print(f"max: {max(latencies):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+分页基准测试：OFFSET/LIMIT 与游标分页在第1页和第10000页的耗时对比。
+
+使用SQLite文件库，默认写入 10000 页 * 10 条数据。
+
+    poetry run python -m scripts.bench_pagination --pages 10000 --limit 10
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from tortoise import Tortoise, fields
+
+from src.common.models import TABLE_INDEXES, Table
+from src.core.dbhelper import DbHelper, encode_cursor
+
+
+class Article(Table):
+    title = fields.CharField(max_length=64)
+
+    class Meta:
+        table = "bench_article"
+        indexes = TABLE_INDEXES
+
+
+async def timed(coro_factory, rounds: int = 20) -> float:
+    await coro_factory()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await coro_factory()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["__main__"]})
+    await Tortoise.generate_schemas()
+
+    total = args.pages * args.limit
+    base = datetime(2024, 1, 1)
+    batch = 10_000
+    for start in range(0, total, batch):
+        await Article.bulk_create([
+            Article(title=f"title{i}", created=base + timedelta(seconds=i))
+            for i in range(start, min(start + batch, total))
+        ])
+
+    dao = DbHelper(Article)
+    last_page_offset = (args.pages - 1) * args.limit
+    # 游标分页的第N页：取上一页最后一条数据生成游标
+    anchor = await Article.all().order_by("-created", "-id").offset(last_page_offset - 1).first()
+    cursor = encode_cursor(anchor)
+
+    offset_first = await timed(lambda: dao.selects(0, args.limit))
+    offset_last = await timed(lambda: dao.selects(last_page_offset, args.limit))
+    cursor_first = await timed(lambda: dao.selects_by_cursor(args.limit))
+    cursor_last = await timed(lambda: dao.selects_by_cursor(args.limit, cursor))
+
+    print(f"数据量: {total}")
+    print(f"OFFSET 第1页: {offset_first:.2f} ms, 第{args.pages}页: {offset_last:.2f} ms")
+    print(f"游标   第1页: {cursor_first:.2f} ms, 第{args.pages}页: {cursor_last:.2f} ms")
+
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
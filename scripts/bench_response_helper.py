@@ -0,0 +1,39 @@
+"""
+response() 辅助函数基准测试：原实现 vs 轻量实现，覆盖成功和错误两条路径。
+
+两种实现输出逐字节一致，由 tests/test_response.py 覆盖。
+
+    poetry run python -m scripts.bench_response_helper
+"""
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.common.schemas import Response
+from src.core.interfaces.response import response
+
+
+def legacy_response(data=None, code=200, message=None):
+    """改造前的实现：jsonable_encoder + Response 泛型模型 + JSONResponse。"""
+    if message is None:
+        message = "请求成功" if code < 400 else "请求失败"
+    return JSONResponse(
+        status_code=code,
+        content=Response(code=code, data=jsonable_encoder(data), message=message).dict(),
+    )
+
+
+def main(rounds: int = 20_000):
+    cases = {
+        "成功": dict(data={"id": 1, "username": "admin"}, message="登录成功！"),
+        "错误": dict(code=404, message="认证要求, 无token！"),
+    }
+    for label, kwargs in cases.items():
+        legacy = timeit.timeit(lambda: legacy_response(**kwargs), number=rounds) / rounds * 1e6
+        fast = timeit.timeit(lambda: response(**kwargs), number=rounds) / rounds * 1e6
+        print(f"{label}路径: 原实现 {legacy:.2f} us/次, 轻量实现 {fast:.2f} us/次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+CustomJSONResponse 渲染基准测试：原三次序列化实现 vs 单次序列化实现。
+
+覆盖小对象和 1000 条列表两种负载。
+
+    poetry run python -m scripts.bench_response_render
+"""
+import datetime
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.common.schemas import Response
+from src.core.custom_response import CustomJSONResponse
+
+
+class LegacyJSONResponse(JSONResponse):
+    """改造前的实现：jsonable_encoder + Response 泛型模型包装后，再用标准库 json 渲染。"""
+
+    def render(self, content: any) -> bytes:
+        if not isinstance(content, dict) or not all(key in content for key in ["code", "data", "message"]):
+            content = Response(code=200, data=jsonable_encoder(content), message="请求成功").dict()
+        return super().render(content)
+
+
+def make_item(i: int) -> dict:
+    return {"id": i, "username": f"user{i}", "status": 1, "created": datetime.datetime(2024, 1, 1).isoformat()}
+
+
+def main(rounds: int = 2_000):
+    payloads = {"小对象": make_item(1), "1000条列表": [make_item(i) for i in range(1000)]}
+    for label, payload in payloads.items():
+        for name, cls in (("原实现", LegacyJSONResponse), ("单次序列化", CustomJSONResponse)):
+            seconds = timeit.timeit(lambda: cls(payload), number=rounds)
+            print(f"{label} {name}: {seconds / rounds * 1e6:.1f} us/次")
+
+
+if __name__ == "__main__":
+    main()
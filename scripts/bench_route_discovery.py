@@ -0,0 +1,140 @@
+"""
+路由注册启动耗时的基准测试。
+
+在临时目录生成 N 个控制器模块，每种方式在独立的子进程中测量 register_routes 的耗时（包含模块导入）：
+- legacy:   原实现，扫描目录并实例化模块 dir() 中定义的类，直到找到 router
+- scan:     扫描目录，只实例化 @controller 注册的类
+- manifest: 按预先生成的路由清单导入，不扫描目录
+
+    poetry run python -m scripts.bench_route_discovery 200
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PACKAGE = "bench_routes_pkg"
+
+CONTROLLER_TEMPLATE = '''from fastapi import APIRouter
+from pydantic import BaseModel
+
+from src.core.load_routers import controller
+
+
+class Item{i}(BaseModel):
+    name: str = ""
+    count: int = 0
+
+
+class Service{i}:
+    def __init__(self):
+        self.items = [Item{i}(name=str(n)) for n in range(100)]
+
+
+@controller
+class Module{i}Controller:
+    def __init__(self):
+        self.router = APIRouter(prefix="/m{i}", tags=["m{i}"])
+
+        @self.router.get("/items")
+        async def list_items():
+            return []
+
+        @self.router.get("/items/{{item_id}}")
+        async def get_item(item_id: int):
+            return item_id
+'''
+
+
+def generate(root: str, count: int):
+    package_dir = os.path.join(root, PACKAGE)
+    os.makedirs(package_dir)
+    open(os.path.join(package_dir, "__init__.py"), "w").close()
+    for i in range(count):
+        module_dir = os.path.join(package_dir, f"m{i}")
+        os.makedirs(module_dir)
+        open(os.path.join(module_dir, "__init__.py"), "w").close()
+        with open(os.path.join(module_dir, f"m{i}_controller.py"), "w") as f:
+            f.write(CONTROLLER_TEMPLATE.format(i=i))
+
+
+def legacy_register(app, package: str):
+    """
+    原 register_routes 的发现逻辑。
+
+    跳过从其他模块导入的类（如 APIRouter、BaseModel），实例化失败时与原实现一样跳过该模块。
+    """
+    import importlib
+    import importlib.util
+
+    modules_path = importlib.util.find_spec(package).submodule_search_locations[0]
+    for module_name in os.listdir(modules_path):
+        module_path = os.path.join(modules_path, module_name)
+        if os.path.isdir(module_path) and not module_name.startswith("__"):
+            for file_name in os.listdir(module_path):
+                if file_name.endswith("_controller.py"):
+                    module = importlib.import_module(f"{package}.{module_name}.{file_name[:-3]}")
+                    try:
+                        for attr_name in dir(module):
+                            attr_value = getattr(module, attr_name)
+                            if isinstance(attr_value, type) and attr_value.__module__ == module.__name__:
+                                instance = attr_value()
+                                if hasattr(instance, "router"):
+                                    app.include_router(instance.router)
+                                    break
+                    except Exception as e:
+                        print(f"注册模块 '{module.__name__}' 时发生错误 ❌ {type(e).__name__}: {e}")
+
+
+def child(mode: str, manifest: str):
+    import contextlib
+    import io
+
+    from fastapi import FastAPI
+
+    from src.core.load_routers import register_routes
+
+    app = FastAPI()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "legacy":
+            legacy_register(app, PACKAGE)
+        elif mode == "scan":
+            register_routes(app, manifest="", package=PACKAGE)
+        else:
+            register_routes(app, manifest=manifest, package=PACKAGE)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"elapsed": elapsed, "routes": len(app.routes)}))
+
+
+def run(root: str, mode: str, manifest: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, os.getcwd()]))
+    output = subprocess.check_output(
+        [sys.executable, __file__, "--child", mode, manifest], env=env, text=True
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(count: int = 200, rounds: int = 3):
+    with tempfile.TemporaryDirectory() as root:
+        generate(root, count)
+        manifest = os.path.join(root, "routes_manifest.json")
+        sys.path[:0] = [root, os.getcwd()]
+        from src.core.load_routers import write_manifest
+
+        write_manifest(manifest, package=PACKAGE)
+
+        print(f"{count} 个控制器模块，每种方式 {rounds} 次取最小值")
+        for mode in ("legacy", "scan", "manifest"):
+            results = [run(root, mode, manifest) for _ in range(rounds)]
+            best = min(result["elapsed"] for result in results)
+            print(f"{mode:<9} {best * 1000:8.1f} ms  路由数 {results[0]['routes']}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,72 @@
+"""
+搜索基准测试：LIKE '%v%' 全表扫描 vs 本地倒排索引。
+
+使用SQLite文件库，默认 100 万行，每种方式执行若干次关键字搜索。
+
+    poetry run python -m scripts.bench_search --rows 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from tortoise import Tortoise, fields
+
+from src.common.models import TABLE_INDEXES, Table
+from src.core.dbhelper import DbHelper
+from src.core.search import ContainsSearchEngine, InvertedIndexEngine
+
+WORDS = ["高性能", "数据库", "索引", "缓存", "fastapi", "python", "异步", "分页", "搜索", "日志", "队列", "连接池"]
+
+
+class Document(Table):
+    title = fields.CharField(max_length=128)
+
+    class Meta:
+        table = "bench_document"
+        indexes = TABLE_INDEXES
+
+
+async def run(engine, dao: DbHelper, keywords: list) -> float:
+    start = time.perf_counter()
+    for keyword in keywords:
+        filters = await engine.filters(Document, {"title": keyword})
+        await dao.selects(0, 10, filters)
+    return (time.perf_counter() - start) / len(keywords) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["__main__"]})
+    await Tortoise.generate_schemas()
+
+    rng = random.Random(42)
+    for start in range(0, args.rows, 10_000):
+        await Document.bulk_create([
+            Document(title=" ".join(rng.sample(WORDS, 3)) + f" {i}")
+            for i in range(start, min(start + 10_000, args.rows))
+        ])
+
+    dao = DbHelper(Document)
+    keywords = [f"{rng.choice(WORDS)} {rng.choice(WORDS)}" for _ in range(args.queries)]
+
+    inverted = InvertedIndexEngine()
+    start = time.perf_counter()
+    await inverted.build(Document, ["title"])
+    print(f"数据量: {args.rows}, 倒排索引构建耗时: {time.perf_counter() - start:.2f}s")
+
+    print(f"contains 全表扫描: {await run(ContainsSearchEngine(), dao, keywords):.2f} ms/次")
+    print(f"倒排索引:         {await run(inverted, dao, keywords):.2f} ms/次")
+
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
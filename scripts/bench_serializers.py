@@ -0,0 +1,65 @@
+"""
+User 序列化方式的基准测试。
+
+使用内存SQLite读取 N 个 User，对比：
+- from_tortoise_orm:       原 UserInDB.from_tortoise_orm，逐个 await
+- construct:               序列化器直接构造 UserInDB（跳过校验）
+- dump_many + dumps:       转换为字典列表后由 orjson/json 编码，对应 Service 列表接口
+- dump_json (TypeAdapter): 由 pydantic-core 直接生成 JSON bytes
+
+    poetry run python -m scripts.bench_serializers --rows 10000
+"""
+import argparse
+import asyncio
+import time
+
+from tortoise import Tortoise
+
+from src.core.encoders import dumps
+from src.core.serializers import build_serializers, get_serializer, register_serializer
+from src.modules.user.models import User
+from src.modules.user.schemas.user import get_user_in_db
+
+
+async def timed(label: str, rows: int, func):
+    start = time.perf_counter()
+    result = func()
+    if asyncio.iscoroutine(result):
+        result = await result
+    elapsed = time.perf_counter() - start
+    print(f"{label:<26} {elapsed * 1000:8.1f} ms  {elapsed / rows * 1e6:6.2f} us/行")
+    return result
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.modules.user.models.user"]})
+    await Tortoise.generate_schemas()
+    await User.bulk_create([User(username=f"user{i}", password="x") for i in range(args.rows)])
+    users = await User.all()
+
+    user_in_db = get_user_in_db()
+    register_serializer(User, exclude=("password",), pydantic_model=user_in_db)
+    build_serializers()
+    serializer = get_serializer(User)
+    # 预热 pydantic 模型和 TypeAdapter 的构建
+    serializer.construct(users[0])
+    serializer.dump_json(users[:1])
+
+    async def from_tortoise_orm():
+        return [await user_in_db.from_tortoise_orm(user) for user in users]
+
+    print(f"{args.rows} 个 User")
+    await timed("from_tortoise_orm", args.rows, from_tortoise_orm)
+    await timed("construct", args.rows, lambda: [serializer.construct(user) for user in users])
+    await timed("dump_many + dumps", args.rows, lambda: dumps(serializer.dump_many(users)))
+    await timed("dump_json (TypeAdapter)", args.rows, lambda: serializer.dump_json(users))
+
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
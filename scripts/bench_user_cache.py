@@ -0,0 +1,59 @@
+"""
+get_current_user 用户缓存的负载基准测试。
+
+使用内存SQLite模拟请求：按热点分布让少量活跃用户反复请求，统计实际的用户查询次数。
+
+    poetry run python -m scripts.bench_user_cache --requests 20000 --users 2000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from tortoise import Tortoise
+
+from src.core import auth
+from src.core.container import container
+from src.modules.user.models import User
+
+
+async def run(requests: int, users: int, cache_size: int) -> tuple:
+    auth.user_cache.maxsize = cache_size
+    auth.user_cache.clear()
+    auth.user_cache.hits = auth.user_cache.misses = auth.user_cache.evictions = 0
+
+    token_manager = container.token_manager()
+    tokens = [token_manager.create_access_token({"sub": f"user{i}"}) for i in range(users)]
+    rng = random.Random(42)
+    # 帕累托分布模拟少量用户占大部分请求
+    picks = [min(int(rng.paretovariate(1.2)) - 1, users - 1) for _ in range(requests)]
+
+    start = time.perf_counter()
+    for i in picks:
+        await auth.get_current_user(tokens[i])
+    elapsed = time.perf_counter() - start
+    queries = auth.user_cache.misses if cache_size else requests
+    return queries, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.modules.user.models.user"]})
+    await Tortoise.generate_schemas()
+    await User.bulk_create([User(username=f"user{i}", password="x") for i in range(args.users)])
+
+    for label, size in (("无缓存", 0), ("有缓存", args.cache_size)):
+        queries, elapsed = await run(args.requests, args.users, size)
+        print(f"{label}: 请求 {args.requests}, 用户查询 {queries}, 耗时 {elapsed:.2f}s")
+    print(f"缓存统计: {auth.user_cache.stats()}")
+
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
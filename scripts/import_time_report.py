@@ -0,0 +1,96 @@
+"""
+应用导入耗时报告。
+
+在新的解释器中以 python -X importtime 导入 src.main，汇总各模块的自身/累计导入耗时，
+并检查启动时不应加载的重量级依赖（jose、passlib、bcrypt、cryptography 等应在首次使用时才导入）。
+超出预算或加载了禁止的模块时以非0状态码退出，可直接用于CI：
+
+    poetry run python scripts/import_time_report.py --budget-ms 800
+    poetry run python scripts/import_time_report.py --top 30 --forbid jose passlib
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+DEFAULT_FORBIDDEN = ["jose", "passlib", "bcrypt", "cryptography"]
+
+
+def collect(target: str) -> list:
+    """
+    导入目标模块并解析 -X importtime 输出。
+
+    Returns:
+        list: [(模块名, 自身耗时us, 累计耗时us, 嵌套层级)]，按导入完成顺序。
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")]))),
+    )
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        raise SystemExit(f"导入 {target} 失败")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # 嵌套导入的模块名按层级多缩进两个空格
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def report(rows: list, target: str, top: int) -> float:
+    """打印耗时排行，返回导入目标模块（含其父包）的累计耗时（毫秒）。"""
+    parts = target.split(".")
+    chain = {".".join(parts[:i]) for i in range(1, len(parts) + 1)}
+    total_us = sum(cumulative for name, _, cumulative, depth in rows if depth == 0 and name in chain)
+
+    print(f"{target} 导入耗时: {total_us / 1000:.1f} ms，共导入 {len(rows)} 个模块\n")
+    print(f"累计耗时前 {top} 的顶层包:")
+    packages = {}
+    for name, _, cumulative, depth in rows:
+        package = name.split(".")[0]
+        if package not in chain and (depth == 0 or name == package):
+            # 同一个包只统计第一次被导入时的累计耗时
+            packages.setdefault(package, cumulative)
+    for package, cumulative in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {package}")
+
+    print(f"\n自身耗时前 {top} 的模块:")
+    for name, self_us, _, _ in sorted(rows, key=lambda row: -row[1])[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+    return total_us / 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="src.main", help="要导入的模块")
+    parser.add_argument("--budget-ms", type=float, default=None, help="累计导入耗时预算（毫秒），超出时返回1")
+    parser.add_argument("--top", type=int, default=15, help="排行显示的条数")
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBIDDEN, help="启动时不应加载的顶层包")
+    args = parser.parse_args()
+
+    rows = collect(args.target)
+    total_ms = report(rows, args.target, args.top)
+
+    failed = False
+    loaded = sorted({name.split(".")[0] for name, _, _, _ in rows} & set(args.forbid))
+    if loaded:
+        print(f"\n❌ 启动时加载了应延迟导入的包: {', '.join(loaded)}")
+        failed = True
+    if args.budget_ms is not None:
+        if total_ms > args.budget_ms:
+            print(f"\n❌ 导入耗时 {total_ms:.1f} ms 超出预算 {args.budget_ms:.1f} ms")
+            failed = True
+        else:
+            print(f"\n✅ 导入耗时 {total_ms:.1f} ms，预算 {args.budget_ms:.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,12 @@
 from tortoise import fields, models
 
+# Table 子类需要在自己的 Meta 中声明的索引，Tortoise 不会从抽象模型的 Meta 继承 indexes：
+#     class Meta:
+#         table = "articles"
+#         indexes = TABLE_INDEXES
+# (created, id) 联合索引用于游标分页的排序和范围查找，见 DbHelper.selects_by_cursor
+TABLE_INDEXES = (("status",), ("created", "id"))
+
 
 class Table(models.Model):
     """
@@ -14,4 +21,3 @@ class Table(models.Model):
     class Meta:
         abstract = True
         ordering = ["-created"]
-        indexes = ("status",)
@@ -55,3 +55,17 @@ class ListAll(GenericModel, Generic[T]):
 
     total: int = Field(..., description="总数")
     list: T = Field(..., description="数据列表")
+
+
+class CursorQuery(BaseModel):
+    """游标分页查询基础数据"""
+
+    cursor: Optional[str] = Field(default=None, description="上一页返回的游标，第一页不传")
+    limit: int = Field(default=10, description="数量", ge=1)
+
+
+class CursorList(GenericModel, Generic[T]):
+    """游标分页查列表时的模型"""
+
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示没有更多数据")
+    list: T = Field(..., description="数据列表")
@@ -1,36 +1,78 @@
 from tortoise.queryset import QuerySet
 
-from src.core.dbhelper import DbHelper
+from src.core.dbhelper import COUNT_EXACT, SOFT_DELETE_FILTER, DbHelper
+from src.core.export import EXPORT_NDJSON, export_response
+from src.core.search import SearchEngine, build_search_filters, default_search_engine
 
 
 class Service:
-    filter_del = {"status__not": 9}
+    # 过滤逻辑删除的条件，没有 status 字段的模型在子类中置为 {}
+    filter_del = SOFT_DELETE_FILTER
+    # 查询字段的匹配方式 {字段: prefix/exact/fulltext}，未配置的字段使用 contains
+    search_fields: dict = {}
+    # fulltext 字段使用的搜索引擎，默认有 FULLTEXT 索引时用 MySQL，否则用 contains；可替换为 InvertedIndexEngine
+    search_engine: SearchEngine = default_search_engine
+    # 导出的字段，默认模型的全部字段，包含敏感字段的模型需要重写
+    export_fields: list = None
 
     def __init__(self, dao: DbHelper):
         self.dao = dao
 
-    async def get_items(self, offset, limit):
+    async def get_items(self, offset, limit, count_mode=COUNT_EXACT):
         """
         分页获取数据, 过滤掉删除
         :param offset: 起始值
         :param limit: 偏移量
+        :param count_mode: 总数统计方式 exact/cached/estimated, 见 DbHelper.count
         :return:
         """
         skip = (offset - 1) * limit
-        return dict(data=await self.dao.selects(skip, limit, Service.filter_del))
+        return dict(data=await self.dao.selects(
+            skip, limit, self.filter_del, count_mode=count_mode, serialize=True
+        ))
 
-    async def query_items(self, query):
+    async def get_items_by_cursor(self, cursor, limit):
+        """
+        游标分页获取数据, 过滤掉删除, 深分页性能稳定
+        :param cursor: 上一页返回的 next_cursor, 第一页为None
+        :param limit: 数量
+        :return:
+        """
+        try:
+            result = await self.dao.selects_by_cursor(limit, cursor, self.filter_del, serialize=True)
+        except ValueError:
+            return dict(code=400, msg="无效的游标")
+        return dict(data=dict(list=result["items"], next_cursor=result["next_cursor"]))
+
+    async def query_items(self, query, count_mode=COUNT_EXACT):
         """
         根据条件查询结果
         :param query:
+        :param count_mode: 总数统计方式 exact/cached/estimated, 见 DbHelper.count
         :return:
         """
         size = query.limit
         skip = (query.offset - 1) * size
         del query.offset, query.limit
-        filters = {f"{k}__contains": v for k, v in query.dict().items()}
-        filters.update(Service.filter_del)
-        return dict(data=await self.dao.selects(skip, size, filters))
+        filters, fulltext = build_search_filters(query.dict(), self.search_fields)
+        if fulltext:
+            filters.update(await self.search_engine.filters(self.dao.model, fulltext))
+        filters.update(self.filter_del)
+        return dict(data=await self.dao.selects(skip, size, filters, count_mode=count_mode, serialize=True))
+
+    def export_items(self, fmt=EXPORT_NDJSON, filters=None, batch_size=1000):
+        """
+        流式导出数据, 过滤掉删除, 内存占用与数据量无关
+        :param fmt: 导出格式 ndjson/csv
+        :param filters: 额外的查询条件
+        :param batch_size: 每批读取行数
+        :return: StreamingResponse
+        """
+        filters = dict(filters or {})
+        filters.update(self.filter_del)
+        fields = self.export_fields or list(self.dao.model._meta.fields_db_projection)
+        batches = self.dao.iter_rows(filters, fields, batch_size)
+        return export_response(batches, fields, fmt, filename=self.dao.model._meta.db_table)
 
     async def delete_item(self, pk):
         """
@@ -39,7 +81,7 @@ class Service:
         :return:
         """
         filters = {"id": pk}
-        filters.update(Service.filter_del)
+        filters.update(self.filter_del)
         if await self.dao.update(filters, {"status": 9}) == 0:
             return dict(code=400, msg="数据不存在")
         return dict()
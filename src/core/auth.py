@@ -1,18 +1,51 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from starlette.responses import JSONResponse
 
-from src.core.jwt import JWTTokenManager
+from src.core.container import container
+from src.core.dbhelper import DbHelper
+from src.core.metrics import register_cache
+from src.core.serializers import register_serializer
+from src.core.settings import settings
 from src.core.interfaces.response import response
 from src.modules.user.models import User
-from src.modules.user.schemas.user import UserInDB
+from src.modules.user.schemas.user import get_user_in_db
+from src.utils.cache import TTLCache
 
 # 创建OAuth2PasswordBearer实例，用于处理token的依赖
 # tokenUrl指定了获取token的endpoint
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/user/token")
 
-# 创建JWTTokenManager实例，用于处理JWT token的操作
-token_manager = JWTTokenManager()
+# 已认证用户缓存 {username: UserInDB}，减少每个请求的用户查询
+user_cache = TTLCache(maxsize=settings.cache.user_size, ttl=settings.cache.user_ttl)
+register_cache("user", user_cache)
+
+
+def invalidate_user(username: str = None):
+    """
+    使用户缓存失效。
+
+    Args:
+        username (str): 需要失效的用户名，为None时清空全部缓存。
+    """
+    if username is None:
+        user_cache.clear()
+    else:
+        user_cache.pop(username)
+
+
+def _on_user_write(action: str, filters: dict = None, data=None):
+    """DbHelper 写用户表时清理缓存，无法确定用户名时整体清空。"""
+    if filters and "username" in filters:
+        invalidate_user(filters["username"])
+    elif action == "update":
+        invalidate_user()
+
+
+DbHelper.add_listener(User, _on_user_write)
+
+# 用户序列化器，UserInDB 由序列化器直接构造，不再走 from_tortoise_orm
+user_serializer = register_serializer(User, exclude=("password",), pydantic_model=get_user_in_db)
 
 
 async def get_refresh_token(token: str = Depends(oauth2_scheme)) -> str:
@@ -51,13 +84,57 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     try:
         # 验证token
-        token_data = token_manager.verify_token(token)
-        # 根据token中的用户名查找用户
-        user = await User.get_or_none(username=token_data.username)
-        if user is None:
-            raise HTTPException(status_code=401, detail="未找到用户")
+        token_data = container.token_manager().verify_token(token)
+        # 优先从缓存读取，未命中时根据token中的用户名查找用户
+        user_in_db = user_cache.get(token_data.username)
+        if user_in_db is None:
+            user = await User.get_or_none(username=token_data.username)
+            if user is None:
+                raise HTTPException(status_code=401, detail="未找到用户")
+            user_in_db = user_serializer.construct(user)
+            user_cache.set(token_data.username, user_in_db)
         # 返回用户信息
-        return await UserInDB.from_tortoise_orm(user)
+        return user_in_db
     except Exception:
         # raise HTTPException(status_code=401, detail="无法验证凭据")
         raise response(code=404, message="无法验证凭据")
+
+
+async def get_request_user(request: Request, token: str = Depends(oauth2_scheme)):
+    """
+    获取本次请求的已认证用户。
+
+    认证中间件已经解析过token并把用户保存在 request.state.user 中，这里直接读取，
+    不再重复解码token和查询数据库。只有在中间件未处理的路由上才回退到 get_current_user，
+    结果同样写回 request.state，保证每个请求最多查询一次用户。
+
+    Args:
+        request (Request): 当前请求。
+        token (str): 从请求中提取的token，由oauth2_scheme依赖提供。
+
+    Returns:
+        UserInDB: 当前认证用户的信息。
+    """
+    user = getattr(request.state, "user", None)
+    if user is None:
+        user = await get_current_user(token)
+        request.state.user = user
+    return user
+
+
+async def require_admin(user=Depends(get_request_user)):
+    """
+    仅允许 settings.admin_usernames 中的用户访问，用于导出等管理接口。
+
+    Args:
+        user (UserInDB): 当前认证用户，由 get_request_user 提供。
+
+    Returns:
+        UserInDB: 当前认证用户的信息。
+
+    Raises:
+        HTTPException: 当前用户不是管理员时抛出 403。
+    """
+    if user.username not in settings.admin_usernames:
+        raise HTTPException(status_code=403, detail="没有访问权限")
+    return user
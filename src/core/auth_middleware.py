@@ -1,32 +1,118 @@
-from fastapi import Request, HTTPException
+import re
+
+from fastapi import FastAPI, HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.core.auth import get_current_user
 from src.core.interfaces.response import response
 
+# 路由函数上的公开标记属性
+PUBLIC_ATTR = "__auth_public__"
+
+
+def public(endpoint):
+    """
+    将路由标记为公开，无需认证即可访问。
+
+    @self.router.post("/login", summary="登录")
+    @public
+    async def login_user(...):
+        ...
+    """
+    setattr(endpoint, PUBLIC_ATTR, True)
+    return endpoint
+
+
+class PublicRouteMatcher:
+    """
+    公开路由匹配器。
+
+    固定路径放入集合做O(1)查找，带路径参数的路由预编译为一个正则表达式。
+    """
+
+    def __init__(self, paths=(), patterns=()):
+        self.paths = frozenset(paths)
+        self.pattern = re.compile("|".join(f"(?:{p})" for p in patterns)) if patterns else None
+
+    def match(self, path: str) -> bool:
+        if path in self.paths:
+            return True
+        return self.pattern is not None and self.pattern.match(path) is not None
+
+    @classmethod
+    def from_app(cls, app: FastAPI) -> "PublicRouteMatcher":
+        """根据文档地址和带 public 标记的路由构建匹配器。"""
+        paths = {app.docs_url, app.redoc_url, app.openapi_url, app.swagger_ui_oauth2_redirect_url}
+        paths.discard(None)
+        patterns = []
+        for route in app.routes:
+            if not getattr(getattr(route, "endpoint", None), PUBLIC_ATTR, False):
+                continue
+            if getattr(route, "param_convertors", None):
+                patterns.append(route.path_regex.pattern)
+            else:
+                paths.add(route.path)
+        return cls(paths, patterns)
+
+
+class AuthMiddleware:
+    """
+    纯ASGI认证中间件。
+
+    公开路由直接放行，其余请求校验Bearer token，并把用户写入 scope["state"]，
+    之后通过 request.state.user 读取。不包装响应流，也不额外创建任务。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.matcher: PublicRouteMatcher | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 路由在中间件添加之后才注册，首次请求时再构建匹配器
+        if self.matcher is None:
+            self.matcher = PublicRouteMatcher.from_app(scope["app"])
+        if self.matcher.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        error = await self.authenticate(scope)
+        if error is not None:
+            await error(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
 
-async def auth_middleware(request: Request, call_next):
-    if request.url.path in ["/docs", "/redoc", "/user/token", "/openapi.json", "/user/login", "/user/register", "/user/refresh"]:
-        return await call_next(request)
+    @staticmethod
+    async def authenticate(scope: Scope):
+        """
+        校验请求头中的token。
 
-    token = request.headers.get("Authorization")
-    if not token:
-        return response(code=404, message="认证要求, 无token！")
+        Returns:
+            认证失败时返回错误响应，成功时返回None。
+        """
+        token = Headers(scope=scope).get("authorization")
+        if not token:
+            return response(code=404, message="认证要求, 无token！")
 
-    try:
-        token_parts = token.split()
-        if len(token_parts) != 2 or token_parts[0].lower() != "bearer":
-            return response(code=404, message="无效的token格式")
+        try:
+            token_parts = token.split()
+            if len(token_parts) != 2 or token_parts[0].lower() != "bearer":
+                return response(code=404, message="无效的token格式")
 
-        user = await get_current_user(token_parts[1])
-        request.state.user = user
-    except HTTPException as e:
-        return response(code=404, message=f"错误-{e}")
+            user = await get_current_user(token_parts[1])
+            scope.setdefault("state", {})["user"] = user
+        except HTTPException as e:
+            return response(code=404, message=f"错误-{e}")
 
-    except Exception:
-        return response(code=404, message="token错误！")
+        except Exception:
+            return response(code=404, message="token错误！")
 
-    return await call_next(request)
+        return None
 
 
 def add_auth_middleware(app):
-    app.middleware("http")(auth_middleware)
+    app.add_middleware(AuthMiddleware)
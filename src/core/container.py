@@ -0,0 +1,103 @@
+"""进程级依赖容器"""
+import threading
+from contextlib import contextmanager
+from typing import Callable, Generic, TypeVar
+
+from src.core.jwt import TokenManager, create_token_manager
+from src.core.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimiter,
+    create_ip_rate_limiter,
+    create_login_rate_limiter,
+)
+from src.core.security import AsyncPasswordManager, BcryptPasswordManager, PasswordManager
+
+T = TypeVar("T")
+
+
+class Provider(Generic[T]):
+    """
+    单例提供者。
+
+    首次调用时通过工厂函数创建实例，之后整个进程复用同一个实例。
+    作为 FastAPI 依赖项使用时传入 dependency：Depends(container.token_manager.dependency)。
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        """
+        Args:
+            factory (Callable[[], T]): 创建实例的工厂函数。
+        """
+        self.factory = factory
+        self._instance: T | None = None
+        self._override: T | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> T:
+        if self._override is not None:
+            return self._override
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self.factory()
+        return self._instance
+
+    async def dependency(self) -> T:
+        """
+        FastAPI 依赖项入口。
+
+        使用异步函数返回实例，避免同步依赖每次都被放到线程池中执行。
+        测试中也可以通过 app.dependency_overrides[provider.dependency] 替换。
+        """
+        return self()
+
+    @contextmanager
+    def override(self, instance: T):
+        """
+        临时替换提供的实例，主要用于测试。
+
+        with container.token_manager.override(FakeTokenManager()):
+            ...
+        """
+        previous, self._override = self._override, instance
+        try:
+            yield instance
+        finally:
+            self._override = previous
+
+    def reset(self):
+        """丢弃已创建的实例，下次调用时重新创建。"""
+        with self._lock:
+            self._instance = None
+
+
+class Container:
+    """
+    进程内共享的服务实例。
+
+    新模块需要共享的管理器时在这里添加 Provider，而不是在各自模块中创建全局变量。
+    """
+
+    def __init__(self):
+        self.password_manager: Provider[PasswordManager] = Provider(BcryptPasswordManager)
+        self.async_password_manager: Provider[AsyncPasswordManager] = Provider(
+            lambda: AsyncPasswordManager(self.password_manager())
+        )
+        self.token_manager: Provider[TokenManager] = Provider(create_token_manager)
+        # 限流计数存储，多实例部署时替换为共享存储
+        self.rate_limit_backend: Provider[RateLimitBackend] = Provider(MemoryRateLimitBackend)
+        self.ip_rate_limiter: Provider[RateLimiter | None] = Provider(
+            lambda: create_ip_rate_limiter(self.rate_limit_backend())
+        )
+        self.login_rate_limiter: Provider[RateLimiter | None] = Provider(
+            lambda: create_login_rate_limiter(self.rate_limit_backend())
+        )
+
+    def shutdown(self):
+        """释放持有资源的实例（线程/进程池等）。"""
+        if self.async_password_manager._instance is not None:
+            self.async_password_manager().shutdown()
+
+
+container = Container()
@@ -1,9 +1,19 @@
+from fastapi import status
 from fastapi.responses import JSONResponse
-from src.core.interfaces.response import response
+
+from src.core.encoders import dumps
 
 
 class CustomJSONResponse(JSONResponse):
+    """
+    统一响应结构的默认响应类。
+
+    路由返回非 Response 对象时 FastAPI 会先经过 jsonable_encoder，到这里的内容已是基础类型；
+    不是 {code, data, message} 结构的内容会被包装后由 encoders.dumps 序列化。
+    需要跳过 jsonable_encoder 的接口直接返回 response()。
+    """
+
     def render(self, content: any) -> bytes:
-        if not isinstance(content, dict) or not all(key in content for key in ["code", "data", "message"]):
-            content = response(data=content).__dict__
-        return super().render(content)
+        if not (isinstance(content, dict) and "code" in content and "data" in content and "message" in content):
+            content = {"code": status.HTTP_200_OK, "data": content, "message": "请求成功"}
+        return dumps(content)
@@ -1,20 +1,40 @@
+from src.core.settings import settings
+
+
+def _credentials(host: str, port: int) -> dict:
+    return {
+        'host': host,
+        'port': port,
+        'user': settings.db.user,
+        'password': settings.db.password,
+        'database': settings.db.database,
+        'minsize': settings.db.minsize,
+        'maxsize': settings.db.maxsize,
+        'connect_timeout': settings.db.connect_timeout,
+        'pool_recycle': settings.db.pool_recycle,
+        'charset': settings.db.charset,
+        'echo': settings.db.echo
+    }
+
+
+# 只读从库连接名，读写分离见 src/core/db_router.py
+REPLICA_CONNECTIONS = [f"replica_{i}" for i in range(len(settings.db.replicas))]
+
+CONNECTIONS = {
+    "default": {
+        'engine': 'src.core.db_backend',  # MySQL or Mariadb，带连接池统计
+        'credentials': _credentials(settings.db.host, settings.db.port)
+    }
+}
+for _name, _address in zip(REPLICA_CONNECTIONS, settings.db.replicas):
+    _host, _, _port = _address.partition(":")
+    CONNECTIONS[_name] = {
+        'engine': 'src.core.db_backend',
+        'credentials': _credentials(_host, int(_port or settings.db.port))
+    }
+
 TORTOISE_ORM = {
-    "connections": {
-        "default": {
-            'engine': 'tortoise.backends.mysql',  # MySQL or Mariadb
-            'credentials': {
-                'host': 'localhost',
-                'port': '3306',
-                'user': 'root',
-                'password': '123456',
-                'database': 'web-test',
-                'minsize': 1,
-                'maxsize': 5,
-                'charset': 'utf8mb4',
-                'echo': True
-            }
-        }
-    },
+    "connections": CONNECTIONS,
     "apps": {
         "models": {
             "models": [
@@ -26,6 +46,8 @@ TORTOISE_ORM = {
             "default_connection": "default",
         }
     },
+    # 配置了从库时启用读写分离路由
+    "routers": ["src.core.db_router.ReplicaRouter"] if REPLICA_CONNECTIONS else [],
     "use_tz": False,  # 建议不要开启，不然存储日期时会有很多坑，时区转换在项目中手动处理更稳妥。
     "timezone": "Asia/Shanghai"
 }
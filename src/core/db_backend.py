@@ -0,0 +1,141 @@
+"""
+带连接池统计的 MySQL 客户端
+
+在 TORTOISE_ORM 的连接配置中使用 "engine": "src.core.db_backend"，
+Tortoise 会加载本模块的 client_class。开启 settings.profiler.enabled 时使用
+ProfiledMySQLClient，把每条 SQL 记录到当前请求的 RequestProfile（见 src/core/db_profiler.py）。
+"""
+import time
+
+from tortoise import connections
+from tortoise.backends.mysql.client import MySQLClient
+
+from src.core.db_profiler import current_profile
+from src.core.settings import settings
+
+
+class PoolStats:
+    """连接池获取连接的统计"""
+
+    def __init__(self):
+        self.waiting = 0
+        self.acquired = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float):
+        self.acquired += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+
+class _TimedAcquire:
+    """包装连接获取的上下文管理器，记录排队数量与等待时间。"""
+
+    def __init__(self, wrapper, stats: PoolStats):
+        self.wrapper = wrapper
+        self.stats = stats
+
+    async def __aenter__(self):
+        self.stats.waiting += 1
+        start = time.perf_counter()
+        try:
+            return await self.wrapper.__aenter__()
+        finally:
+            self.stats.waiting -= 1
+            self.stats.record_wait(time.perf_counter() - start)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return await self.wrapper.__aexit__(exc_type, exc_val, exc_tb)
+
+
+class InstrumentedMySQLClient(MySQLClient):
+    """记录连接池使用情况的 MySQLClient"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_stats = PoolStats()
+
+    def acquire_connection(self):
+        return _TimedAcquire(super().acquire_connection(), self.pool_stats)
+
+    def stats(self) -> dict:
+        """
+        连接池实时统计。
+
+        Returns:
+            dict: in_use 使用中, idle 空闲, size 当前连接数, waiters 等待获取连接的协程数,
+                wait_avg_ms / wait_max_ms 获取连接的平均/最大等待时间。
+        """
+        pool = self._pool
+        size = pool.size if pool is not None else 0
+        idle = pool.freesize if pool is not None else 0
+        stats = self.pool_stats
+        return dict(
+            minsize=self.pool_minsize,
+            maxsize=self.pool_maxsize,
+            size=size,
+            in_use=size - idle,
+            idle=idle,
+            waiters=stats.waiting,
+            acquired=stats.acquired,
+            wait_avg_ms=stats.wait_total / stats.acquired * 1000 if stats.acquired else 0.0,
+            wait_max_ms=stats.wait_max * 1000,
+        )
+
+
+class ProfiledMySQLClient(InstrumentedMySQLClient):
+    """
+    记录请求内SQL的 MySQLClient。
+
+    当前请求没有开启分析时只多一次 ContextVar 读取；事务内的查询由 Tortoise 的
+    TransactionWrapper 执行，不在记录范围内。
+    """
+
+    async def execute_query(self, query: str, values: list | None = None):
+        profile = current_profile()
+        if profile is None:
+            return await super().execute_query(query, values)
+        start = time.perf_counter()
+        result = await super().execute_query(query, values)
+        profile.record(query, time.perf_counter() - start, len(result[1]))
+        return result
+
+    async def execute_query_dict(self, query: str, values: list | None = None):
+        profile = current_profile()
+        if profile is None:
+            return await super().execute_query_dict(query, values)
+        start = time.perf_counter()
+        result = await super().execute_query_dict(query, values)
+        profile.record(query, time.perf_counter() - start, len(result))
+        return result
+
+    async def execute_insert(self, query: str, values: list):
+        profile = current_profile()
+        if profile is None:
+            return await super().execute_insert(query, values)
+        start = time.perf_counter()
+        result = await super().execute_insert(query, values)
+        profile.record(query, time.perf_counter() - start, 1)
+        return result
+
+    async def execute_many(self, query: str, values: list):
+        profile = current_profile()
+        if profile is None:
+            return await super().execute_many(query, values)
+        start = time.perf_counter()
+        result = await super().execute_many(query, values)
+        profile.record(query, time.perf_counter() - start, len(values))
+        return result
+
+
+def pool_stats() -> dict:
+    """返回所有已初始化连接的连接池统计 {连接名: 统计}。"""
+    return {
+        conn.connection_name: conn.stats()
+        for conn in connections.all()
+        if isinstance(conn, InstrumentedMySQLClient)
+    }
+
+
+client_class = ProfiledMySQLClient if settings.profiler.enabled else InstrumentedMySQLClient
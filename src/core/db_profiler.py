@@ -0,0 +1,138 @@
+"""
+请求级 SQL 分析
+
+settings.profiler.enabled 为 True 时，数据库连接使用 ProfiledMySQLClient 并注册 DbProfilerMiddleware：
+请求头带 X-DB-Profile: 1（或 settings.profiler.always 为 True）的请求会记录每条 SQL 的耗时、返回行数和调用位置，
+相同结构的 SQL 重复执行超过阈值时标记为 N+1。摘要写入响应头 X-DB-Profile，完整记录通过
+/internal/db-profile 查看。未开启时既不替换客户端也不注册中间件，没有任何额外开销。
+"""
+import re
+import sys
+import uuid
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.settings import settings
+
+_current_profile: ContextVar["RequestProfile | None"] = ContextVar("db_profile", default=None)
+
+# 最近的分析结果
+recent_profiles: deque = deque(maxlen=settings.profiler.history)
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+# 调用位置跳过的框架和本模块的文件
+_SKIP_FILES = ("db_profiler.py", "db_backend.py", "dbhelper.py", "metrics.py")
+
+
+def query_shape(sql: str) -> str:
+    """把SQL中的字面量替换为 ?，IN 列表合并为一个占位，用于识别重复的查询结构。"""
+    shape = _STRING_RE.sub("?", sql)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    return " ".join(shape.split())
+
+
+def _call_site() -> str:
+    """返回项目代码中发起查询的位置 文件:行号。"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if "/src/" in filename.replace("\\", "/") and not filename.endswith(_SKIP_FILES):
+            return f"{filename.rsplit('/src/', 1)[-1]}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class RequestProfile:
+    """一次请求的 SQL 记录"""
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.queries: list = []
+
+    def record(self, sql: str, elapsed: float, rows: int | None):
+        self.queries.append(dict(
+            sql=sql,
+            shape=query_shape(sql),
+            elapsed_ms=elapsed * 1000,
+            rows=rows,
+            site=_call_site(),
+        ))
+
+    def n_plus_one(self) -> list:
+        """重复次数达到阈值的查询结构。"""
+        counts = Counter(query["shape"] for query in self.queries)
+        threshold = settings.profiler.n_plus_one_threshold
+        result = []
+        for shape, count in counts.items():
+            if count >= threshold:
+                sites = sorted({query["site"] for query in self.queries if query["shape"] == shape})
+                result.append(dict(shape=shape, count=count, sites=sites))
+        return result
+
+    def summary(self) -> dict:
+        return dict(
+            id=self.id,
+            method=self.method,
+            path=self.path,
+            queries=len(self.queries),
+            total_ms=sum(query["elapsed_ms"] for query in self.queries),
+            n_plus_one=self.n_plus_one(),
+        )
+
+    def header(self) -> str:
+        summary = self.summary()
+        return (
+            f"id={summary['id']}; queries={summary['queries']}; "
+            f"time_ms={summary['total_ms']:.1f}; n_plus_one={len(summary['n_plus_one'])}"
+        )
+
+
+def current_profile() -> RequestProfile | None:
+    return _current_profile.get()
+
+
+def get_profile(profile_id: str) -> dict | None:
+    """按 id 查找最近的分析结果，包含每条 SQL。"""
+    for profile in recent_profiles:
+        if profile.id == profile_id:
+            return dict(profile.summary(), statements=profile.queries)
+    return None
+
+
+class DbProfilerMiddleware:
+    """按请求开启 SQL 分析的纯ASGI中间件"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.header_name = settings.profiler.header.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not (
+                settings.profiler.always or Headers(scope=scope).get(settings.profiler.header) == "1"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self.header_name, profile.header().encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            recent_profiles.append(profile)
@@ -0,0 +1,135 @@
+"""
+读写分离
+
+配置 APP_DB__REPLICAS 后，TORTOISE_ORM 会注册 ReplicaRouter：读操作路由到健康的从库，写操作走主库。
+同一请求内发生写操作后的一段时间内（read_your_writes_window），读操作也走主库，保证读到自己刚写入的数据。
+路由只能感知经过 Tortoise 路由的写操作，带 using_db 的写入和原生SQL由 DbHelper 调用 mark_write 打开该窗口。
+事务中的读操作始终使用事务所在的连接，不会落到从库。
+"""
+import asyncio
+import itertools
+import time
+from contextvars import ContextVar
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseTransactionWrapper
+
+from src.core.dbConfig import REPLICA_CONNECTIONS
+from src.core.log_config import error_logger
+from src.core.settings import settings
+
+# 当前请求最近一次写操作的时间，每个请求运行在独立的上下文中
+_last_write_at: ContextVar[float] = ContextVar("last_write_at", default=float("-inf"))
+
+
+
+def mark_write():
+    """记录当前请求发生了写操作，read_your_writes_window 内的读操作走主库。"""
+    _last_write_at.set(time.monotonic())
+
+
+ROUND_ROBIN = "round_robin"
+LEAST_BUSY = "least_busy"
+
+
+class ReplicaSet:
+    """
+    从库集合。
+
+    负责选择从库，并定期检查复制延迟，把延迟过大或无法连接的从库摘除，恢复后重新加入。
+    """
+
+    def __init__(self, names: list, strategy: str = ROUND_ROBIN, max_lag: float = 5, check_interval: float = 5):
+        """
+        Args:
+            names (list): 从库连接名。
+            strategy (str): 选择策略 round_robin/least_busy。
+            max_lag (float): 允许的最大复制延迟（秒）。
+            check_interval (float): 健康检查间隔（秒）。
+        """
+        self.names = list(names)
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.healthy = list(self.names)
+        self._cycle = itertools.cycle(self.healthy)
+        self._task: asyncio.Task | None = None
+
+    def choose(self) -> str | None:
+        """选择一个健康的从库，没有可用从库时返回None（走主库）。"""
+        if not self.healthy:
+            return None
+        if self.strategy == LEAST_BUSY:
+            return min(self.healthy, key=self._busy)
+        return next(self._cycle)
+
+    @staticmethod
+    def _busy(name: str) -> int:
+        stats = connections.get(name).stats()
+        return stats["in_use"] + stats["waiters"]
+
+    async def lag(self, name: str) -> float | None:
+        """查询从库复制延迟（秒），复制未运行时返回None。"""
+        rows = await connections.get(name).execute_query_dict("SHOW SLAVE STATUS")
+        if not rows:
+            return None
+        value = rows[0].get("Seconds_Behind_Master")
+        return None if value is None else float(value)
+
+    async def check(self):
+        """检查所有从库，更新健康列表。"""
+        healthy = []
+        for name in self.names:
+            try:
+                lag = await self.lag(name)
+            except Exception as e:
+                error_logger.error(f"从库 {name} 健康检查失败: {e}")
+                continue
+            if lag is None or lag > self.max_lag:
+                error_logger.error(f"从库 {name} 复制延迟过大或复制已停止: {lag}")
+                continue
+            healthy.append(name)
+        if healthy != self.healthy:
+            self.healthy = healthy
+            self._cycle = itertools.cycle(healthy)
+
+    async def _run_checks(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+    async def start(self):
+        """启动后台健康检查。"""
+        if self.names and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._run_checks())
+
+    async def stop(self):
+        """停止后台健康检查。"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+replica_set = ReplicaSet(
+    REPLICA_CONNECTIONS,
+    strategy=settings.db.read_strategy,
+    max_lag=settings.db.replica_max_lag,
+    check_interval=settings.db.replica_check_interval,
+)
+
+
+class ReplicaRouter:
+    """Tortoise 数据库路由，由 TORTOISE_ORM["routers"] 加载。"""
+
+    def db_for_read(self, model):
+        # 事务中 connections.get 返回事务连接，返回None使读操作留在事务内
+        if isinstance(model._meta.db, BaseTransactionWrapper):
+            return None
+        if time.monotonic() - _last_write_at.get() < settings.db.read_your_writes_window:
+            return None
+        return replica_set.choose()
+
+    def db_for_write(self, model):
+        mark_write()
+        return None
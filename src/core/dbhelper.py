@@ -1,8 +1,97 @@
 """数据库通用查询方法"""
+import asyncio
+import base64
+import inspect
+import json
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+
 from tortoise import connections
+from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
+
+from src.core.db_router import mark_write
+from src.core.metrics import register_cache, track_db
+from src.core.serializers import get_serializer
+from src.core.settings import settings
+from src.utils.cache import TTLCache
+
+# 分页总数缓存配置
+COUNT_CACHE_SIZE = settings.cache.count_size
+COUNT_CACHE_TTL = settings.cache.count_ttl
+# 估算总数低于该值时仍然精确计数
+ESTIMATE_MIN_ROWS = settings.cache.count_estimate_min_rows
+# 批量新增每批行数
+INSERT_BATCH_SIZE = settings.insert_batch_size
+
+# 总数统计方式
+COUNT_EXACT = "exact"  # 每次 COUNT(*)
+COUNT_CACHED = "cached"  # 按条件缓存 COUNT(*) 结果, 写操作时清空
+COUNT_ESTIMATED = "estimated"  # 无过滤条件的大表使用表统计信息估算, 有条件时精确计数
+
+# 逻辑删除过滤条件, 估算总数时视为无条件
+SOFT_DELETE_FILTER = {"status__not": 9}
+
+# 不修改数据的原生SQL, 其余语句视为写操作
+_READ_ONLY_SQL = re.compile(r"\s*(SELECT|SHOW|EXPLAIN|DESC|DESCRIBE)\b", re.IGNORECASE)
+
+
+def encode_cursor(obj) -> str:
+    """
+    根据对象的 (created, id) 生成不透明的游标, created 为空时记为 null
+    :param obj: 模型对象
+    :return: base64 游标串
+    """
+    created = obj.created.isoformat() if obj.created is not None else None
+    raw = json.dumps([created, obj.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    解析游标
+    :param cursor: encode_cursor 生成的游标串
+    :return: (created, id), created 可能为None
+    """
+    try:
+        created, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (datetime.fromisoformat(created) if created is not None else None), int(pk)
+    except (ValueError, TypeError) as e:
+        raise ValueError("无效的游标") from e
+
+
+async def batched(objs, size: int):
+    """
+    将可迭代对象或异步可迭代对象按固定大小分批
+    :param objs: Iterable / AsyncIterable
+    :param size: 每批数量
+    :return: 异步生成器, 每次产出一个列表
+    """
+    batch = []
+    if hasattr(objs, "__aiter__"):
+        async for obj in objs:
+            batch.append(obj)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    else:
+        for obj in objs:
+            batch.append(obj)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
 
 
 class DbHelper:
+    # 写操作监听器 {模型类: [回调]}，回调签名 callback(action, filters, data)，可以是协程函数
+    _listeners: dict = defaultdict(list)
+    # 分页总数缓存 {模型类: TTLCache}
+    _count_caches: dict = {}
+
     def __init__(self, model):
         """
         初始化
@@ -10,6 +99,33 @@ class DbHelper:
         """
         self.model = model
 
+    @classmethod
+    def add_listener(cls, model, callback):
+        """
+        注册写操作监听器, 用于缓存失效等场景
+        :param model: 模型类 orm model
+        :param callback: callback(action, filters, data), action 为 insert/inserts/update
+        :return:
+        """
+        cls._listeners[model].append(callback)
+
+    async def _notify(self, action: str, filters: dict = None, data=None):
+        """
+        通知该模型的写操作监听器
+        :param action: insert/inserts/update
+        :param filters: 更新条件
+        :param data: 新增的对象或更新的数据
+        :return:
+        """
+        mark_write()
+        count_cache = DbHelper._count_caches.get(self.model)
+        if count_cache is not None:
+            count_cache.clear()
+        for callback in DbHelper._listeners.get(self.model, ()):
+            result = callback(action, filters, data)
+            if inspect.isawaitable(result):
+                await result
+
     def __filter(self, kwargs: dict):
         """
         过滤数据,默认过滤数据
@@ -18,6 +134,7 @@ class DbHelper:
         """
         return self.model.filter(**kwargs)
 
+    @track_db("select")
     async def select(self, kwargs: dict = None):
         """
         查询符合条件的第一个对象, 查无结果时返回None
@@ -28,6 +145,7 @@ class DbHelper:
             kwargs = {}
         return await self.__filter(kwargs).first()
 
+    @track_db("update")
     async def update(self, filters: dict = None, updates: dict = None):
         """
         更新单条数据
@@ -35,7 +153,9 @@ class DbHelper:
         :param updates: 待更新数据 {"status": 5}
         :return: 0 失败， 1 成功
         """
-        return await self.__filter(filters).update(**updates)
+        rows = await self.__filter(filters).update(**updates)
+        await self._notify("update", filters, updates)
+        return rows
 
     async def delete(self, pk: int) -> int:
         """
@@ -47,27 +167,35 @@ class DbHelper:
         updates = dict(status=9)
         return await self.update(filters=filters, updates=updates)
 
+    @track_db("insert")
     async def insert(self, data: dict):
         """
         新增一条数据
         :param data: 模型字典
         :return: 新增之后的对象
         """
-        return await self.model.create(**data)
+        obj = await self.model.create(**data)
+        await self._notify("insert", data=obj)
+        return obj
 
+    @track_db("selects")
     async def selects(
-            self, offset: int, limit: int, kwargs: dict = None, order_by: str = "-created"
+            self, offset: int, limit: int, kwargs: dict = None, order_by: str = "-created",
+            count_mode: str = COUNT_EXACT, serialize: bool = False
     ) -> dict:
         """
         条件分页查询数据列表, 支持排序
+        分页查询与总数查询并发执行, 各自使用连接池中的连接
         Args:
             offset: 偏移量
             limit: 数量
             kwargs: 条件 {}
             order_by: 排序，默认为None， 传入 -字段名 降序 字段名升序
+            count_mode: 总数统计方式 exact/cached/estimated
+            serialize: 为True时 items 通过模型序列化器转换为字典列表, 见 src/core/serializers.py
             SQL => select * from model where xx=xx ... order by xx limit offset, limit
         Returns:
-            {"items": Model列表, "total": "数量"}
+            {"items": Model列表或字典列表, "total": "数量"}
         """
         if kwargs is None:
             kwargs = {}
@@ -75,19 +203,168 @@ class DbHelper:
         if order_by is not None:
             objs = objs.order_by(order_by)
 
-        return dict(
-            items=await objs.offset(offset).limit(limit), total=await objs.count()
+        items, total = await asyncio.gather(
+            objs.offset(offset).limit(limit), self._count(kwargs, count_mode)
         )
+        if serialize:
+            items = get_serializer(self.model).dump_many(items)
+        return dict(items=items, total=total)
 
-    async def inserts(self, objs: list):
+    @track_db("selects_by_cursor")
+    async def selects_by_cursor(
+            self, limit: int, cursor: str = None, kwargs: dict = None, serialize: bool = False
+    ) -> dict:
         """
-        批量新增数据
-        :param objs: 模型列表
-        :return:
+        游标(keyset)分页查询, 按 created, id 倒序
+        不使用 OFFSET, 深分页与第一页耗时相同, 插入新数据时不会导致翻页错位
+        依赖 (created, id) 联合索引, 模型的 Meta 需要声明 indexes = TABLE_INDEXES, 见 src/common/models.py
+        created 为空的行在倒序中排在最后(MySQL/SQLite 中 NULL 小于任何值), 同样按 id 倒序翻页
+        Args:
+            limit: 数量
+            cursor: 上一页返回的 next_cursor, 第一页传 None
+            kwargs: 条件 {}
+            serialize: 为True时 items 通过模型序列化器转换为字典列表
+            SQL => select * from model where xx=xx
+                   and (created < c or (created = c and id < i) or created is null)
+                   order by created desc, id desc limit limit + 1
+        Returns:
+            {"items": Model列表或字典列表, "next_cursor": "下一页游标, 没有更多数据时为None"}
+        Raises:
+            ValueError: 游标无效
         """
-        await self.model.bulk_create([self.model(**obj) for obj in objs])
+        if kwargs is None:
+            kwargs = {}
+        objs = self.__filter(kwargs)
+        if cursor is not None:
+            created, pk = decode_cursor(cursor)
+            if created is None:
+                # 已经翻到 created 为空的部分
+                objs = objs.filter(created__isnull=True, id__lt=pk)
+            else:
+                objs = objs.filter(
+                    Q(created__lt=created) | Q(created=created, id__lt=pk) | Q(created__isnull=True)
+                )
+
+        # 多取一条用于判断是否还有下一页
+        items = await objs.order_by("-created", "-id").limit(limit + 1)
+        next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+        items = items[:limit]
+        if serialize:
+            items = get_serializer(self.model).dump_many(items)
+        return dict(items=items, next_cursor=next_cursor)
+
+    async def iter_rows(self, kwargs: dict = None, fields: list = None, batch_size: int = 1000):
+        """
+        按主键顺序分批遍历符合条件的数据, 返回字典, 内存占用只与批大小有关
+        :param kwargs: 条件 {}
+        :param fields: 返回的字段, 默认全部字段
+        :param batch_size: 每批行数
+        :return: 异步生成器, 每次产出一批字典列表
+            SQL => select fields from model where xx=xx and id > last_id order by id limit batch_size
+        """
+        if kwargs is None:
+            kwargs = {}
+        if fields is None:
+            fields = list(self.model._meta.fields_db_projection)
+        pk = self.model._meta.pk_attr
+        values_fields = fields if pk in fields else [pk, *fields]
+        last_pk = None
+        while True:
+            objs = self.__filter(kwargs)
+            if last_pk is not None:
+                objs = objs.filter(**{f"{pk}__gt": last_pk})
+            rows = await objs.order_by(pk).limit(batch_size).values(*values_fields)
+            if not rows:
+                break
+            last_pk = rows[-1][pk]
+            if values_fields is not fields:
+                for row in rows:
+                    del row[pk]
+            yield rows
+            if len(rows) < batch_size:
+                break
+
+    @track_db("count")
+    async def count(self, kwargs: dict = None, count_mode: str = COUNT_EXACT) -> int:
+        """
+        统计符合条件的数据数量
+        :param kwargs: 条件 {}
+        :param count_mode: exact 精确计数; cached 缓存计数结果;
+            estimated 除逻辑删除外没有其他条件时, 大表使用表统计信息估算, 否则精确计数
+        :return: 数量
+        """
+        return await self._count(kwargs, count_mode)
+
+    async def _count(self, kwargs: dict = None, count_mode: str = COUNT_EXACT) -> int:
+        """count 的实现, selects 内部调用时不重复记录查询指标"""
+        if kwargs is None:
+            kwargs = {}
+        if count_mode == COUNT_ESTIMATED:
+            # 表统计信息不能反映过滤条件, 有条件时精确计数
+            if any(key not in SOFT_DELETE_FILTER or SOFT_DELETE_FILTER[key] != value for key, value in kwargs.items()):
+                return await self.__filter(kwargs).count()
+            estimated = await self._estimated_count()
+            if estimated >= ESTIMATE_MIN_ROWS:
+                return estimated
+            count_mode = COUNT_CACHED
+        if count_mode != COUNT_CACHED:
+            return await self.__filter(kwargs).count()
+
+        count_cache = DbHelper._count_caches.get(self.model)
+        if count_cache is None:
+            count_cache = DbHelper._count_caches[self.model] = TTLCache(COUNT_CACHE_SIZE, COUNT_CACHE_TTL)
+            register_cache(f"count:{self.model.__name__}", count_cache)
+        key = repr(sorted(kwargs.items()))
+        total = count_cache.get(key)
+        if total is None:
+            total = await self.__filter(kwargs).count()
+            count_cache.set(key, total)
+        return total
+
+    @track_db("estimated_count")
+    async def estimated_count(self) -> int:
+        """
+        根据表统计信息估算总行数, 不扫描数据, 结果为近似值且忽略过滤条件
+        :return: select TABLE_ROWS from information_schema.TABLES where TABLE_NAME = model表名
+        """
+        return await self._estimated_count()
+
+    async def _estimated_count(self) -> int:
+        sql = (
+            "SELECT TABLE_ROWS AS total FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+        )
+        rows = await self.model._meta.db.execute_query_dict(sql, [self.model._meta.db_table])
+        return int(rows[0]["total"] or 0) if rows else 0
+
+    @track_db("inserts")
+    async def inserts(
+            self, objs, batch_size: int = INSERT_BATCH_SIZE, update_fields: list = None, on_conflict: list = None
+    ) -> list:
+        """
+        分批流式新增数据, 每批在独立事务中写入, 内存占用只与批大小有关
+        :param objs: 模型字典的可迭代对象或异步可迭代对象, 如列表、生成器
+        :param batch_size: 每批行数, 控制单条 SQL 大小不超过 max_allowed_packet
+        :param update_fields: 传入时按 upsert 写入, 冲突时更新这些字段 (MySQL: INSERT ... ON DUPLICATE KEY UPDATE)
+        :param on_conflict: 冲突判断的字段, 默认主键, MySQL 按表上的唯一索引判断
+        :return: 每批统计 [{"batch": 1, "rows": 1000, "elapsed": 0.05}]
+        """
+        if update_fields and not on_conflict:
+            on_conflict = [self.model._meta.pk_attr]
+        stats = []
+        async for batch in batched(objs, batch_size):
+            start = time.perf_counter()
+            instances = [self.model(**obj) for obj in batch]
+            async with in_transaction(self.model._meta.default_connection) as conn:
+                await self.model.bulk_create(
+                    instances, update_fields=update_fields, on_conflict=on_conflict, using_db=conn
+                )
+            await self._notify("inserts", data=instances)
+            stats.append(dict(batch=len(stats) + 1, rows=len(instances), elapsed=time.perf_counter() - start))
+        return stats
 
     @classmethod
+    @track_db("raw_sql")
     async def raw_sql(cls, sql: str, args: list = None):
         """
         手动执行SQL
@@ -98,4 +375,49 @@ class DbHelper:
         db = connections.get("default")
         if args is None:
             args = []
+        if not _READ_ONLY_SQL.match(sql):
+            # 原生SQL不经过数据库路由，写语句需要手动打开读自己写的窗口
+            mark_write()
         return await db.execute_query_dict(sql, args)
+
+    @classmethod
+    async def raw_sql_stream(
+            cls, sql: str, args: list = None, chunk_size: int = 1000, as_dict: bool = True,
+            connection_name: str = "default"
+    ):
+        """
+        使用服务端游标(SSCursor)流式执行SQL, 按块返回结果, 适合百万行级别的报表查询
+        提前停止迭代时建议使用 contextlib.aclosing 保证连接及时释放:
+            async with aclosing(DbHelper.raw_sql_stream(sql)) as chunks:
+                async for rows in chunks: ...
+        :param sql:
+        :param args: sql参数
+        :param chunk_size: 每块行数
+        :param as_dict: True 返回字典, False 返回元组以节省内存
+        :param connection_name: 连接名
+        :return: 异步生成器, 每次产出一块结果列表
+        """
+        from aiomysql import SSCursor, SSDictCursor
+        from tortoise.backends.mysql.client import TransactionWrapper
+
+        db = connections.get(connection_name)
+        if args is None:
+            args = []
+        async with db.acquire_connection() as conn:
+            cursor = await conn.cursor(SSDictCursor if as_dict else SSCursor)
+            finished = False
+            try:
+                await cursor.execute(sql, args)
+                while True:
+                    rows = await cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+                finished = True
+            finally:
+                if finished or isinstance(db, TransactionWrapper):
+                    # 关闭服务端游标会读完剩余结果, 事务中的连接必须保持可用
+                    await cursor.close()
+                else:
+                    # 提前退出时直接关闭连接, 连接池会丢弃已关闭的连接, 无需读完剩余结果
+                    conn.close()
@@ -0,0 +1,101 @@
+"""
+JSON 序列化
+
+- dumps: 安装 orjson 时使用 orjson，否则回退到标准库 json，用于 CustomJSONResponse、导出等。
+- jsonable + dumps_stdlib: 与 jsonable_encoder + JSONResponse 的输出字节完全一致，用于 response()。
+  orjson 的浮点数格式与标准库不同（如 1e20 与 1e+20），需要与原实现逐字节一致时不能使用 orjson。
+"""
+import dataclasses
+import datetime
+import json
+from decimal import Decimal
+
+from fastapi.encoders import decimal_encoder, jsonable_encoder
+from pydantic import BaseModel
+from tortoise.models import Model
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 是可选依赖
+    orjson = None
+
+# jsonable_encoder 原样返回的类型
+_PRIMITIVES = frozenset((str, int, float, bool, type(None)))
+
+
+def _model_dict(obj: Model) -> dict:
+    return {name: getattr(obj, name) for name in obj._meta.fields_db_projection}
+
+
+def jsonable(obj):
+    """
+    转换为可以直接 JSON 编码的基础类型，结果与 fastapi.encoders.jsonable_encoder 相同。
+
+    基础类型、字典、列表和 pydantic 模型走快速路径，Tortoise 模型按数据库字段转换，其余类型交给 jsonable_encoder。
+    """
+    cls = type(obj)
+    if cls in _PRIMITIVES:
+        return obj
+    if cls is dict:
+        result = {}
+        for key, value in obj.items():
+            if type(key) is not str or key.startswith("_sa"):
+                # 非字符串键和 SQLAlchemy 私有键按 jsonable_encoder 的规则处理
+                return jsonable_encoder(obj)
+            result[key] = jsonable(value)
+        return result
+    if cls is list or cls is tuple:
+        return [jsonable(item) for item in obj]
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    if isinstance(obj, Model):
+        return jsonable(_model_dict(obj))
+    return jsonable_encoder(obj)
+
+
+def dumps_stdlib(content) -> bytes:
+    """标准库编码，参数与 JSONResponse.render 一致。content 需要已经是基础类型，见 jsonable。"""
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def default(obj):
+    """
+    处理 json 无法直接序列化的对象，转换规则与 jsonable_encoder 相同。
+
+    orjson 原生支持 datetime/UUID/dataclass/Enum，标准库回退时在这里统一转换。
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    if isinstance(obj, Model):
+        return _model_dict(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, Decimal):
+        # 整数值输出为 int，其余为 float
+        return decimal_encoder(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    # UUID、Enum、Path、IP地址等其余类型
+    return jsonable_encoder(obj)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(content) -> bytes:
+        """一次性将对象序列化为 UTF-8 JSON 字节串。"""
+        return orjson.dumps(content, default=default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(content) -> bytes:
+        """一次性将对象序列化为 UTF-8 JSON 字节串。"""
+        return json.dumps(
+            content, default=default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
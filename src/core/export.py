@@ -0,0 +1,69 @@
+"""列表数据的流式导出"""
+import csv
+import io
+from datetime import date, datetime, time
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+from src.core.encoders import dumps
+
+EXPORT_NDJSON = "ndjson"
+EXPORT_CSV = "csv"
+
+MEDIA_TYPES = {
+    EXPORT_NDJSON: "application/x-ndjson",
+    EXPORT_CSV: "text/csv; charset=utf-8",
+}
+
+
+async def ndjson_chunks(batches: AsyncIterator[list]):
+    """每批数据编码为若干行 JSON。"""
+    async for rows in batches:
+        yield b"".join(dumps(row) + b"\n" for row in rows)
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+async def csv_chunks(batches: AsyncIterator[list], fields: list):
+    """先输出表头，之后每批数据编码为若干行 CSV。带 BOM 便于 Excel 识别中文。"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(row[field]) for field in fields] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_response(batches: AsyncIterator[list], fields: list, fmt: str = EXPORT_NDJSON,
+                    filename: str = "export") -> StreamingResponse:
+    """
+    将分批查询结果以 NDJSON 或 CSV 流式输出。
+
+    每批编码后才读取下一批，StreamingResponse 在客户端读取变慢时会阻塞在 send 上，
+    从而暂停数据库读取，内存占用与导出总行数无关。
+
+    Args:
+        batches (AsyncIterator[list]): 分批产出字典列表的异步迭代器，如 DbHelper.iter_rows。
+        fields (list): 导出的字段，CSV 按该顺序输出列。
+        fmt (str): 导出格式 ndjson/csv。
+        filename (str): 下载文件名，不含扩展名。
+
+    Returns:
+        StreamingResponse: 流式响应。
+    """
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    body = csv_chunks(batches, fields) if fmt == EXPORT_CSV else ndjson_chunks(batches)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -1,8 +1,22 @@
+from functools import lru_cache
+
 from fastapi import status
-from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 
-from src.common.schemas import Response
+from src.core.encoders import dumps_stdlib, jsonable
+
+
+class PreEncodedJSONResponse(JSONResponse):
+    """content 为已编码好的 JSON 字节串，直接作为响应体。"""
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+
+@lru_cache(maxsize=256)
+def _encode_message(code: int, message: str) -> bytes:
+    """编码不含数据的响应体并缓存，常量错误响应只编码一次。"""
+    return dumps_stdlib({"code": code, "data": None, "message": message})
 
 
 def response(data=None, code=status.HTTP_200_OK, message=None):
@@ -10,6 +24,8 @@ def response(data=None, code=status.HTTP_200_OK, message=None):
     统一接口的响应结构。
 
     该函数用于生成统一格式的JSON响应，包含响应码、数据和消息。
+    不再构建 pydantic Response 模型和中间 JSONResponse：数据由 encoders.jsonable 转换（基础类型和 pydantic 模型
+    走快速路径，其余交给 jsonable_encoder），再按 JSONResponse 的参数编码一次，输出与原实现逐字节一致。
 
     参数:
     - data (Any): 响应的数据，默认为None。
@@ -23,14 +39,12 @@ def response(data=None, code=status.HTTP_200_OK, message=None):
     if message is None:
         message = "请求成功" if code < 400 else "请求失败"
 
-    json_compatible_data = jsonable_encoder(data)
-    return JSONResponse(
+    if data is None:
+        return PreEncodedJSONResponse(status_code=code, content=_encode_message(code, message))
+
+    return PreEncodedJSONResponse(
         status_code=code,
-        content=Response(
-            code=code,
-            data=json_compatible_data,
-            message=message
-        ).dict()
+        content=dumps_stdlib({"code": code, "data": jsonable(data), "message": message})
     )
 
 
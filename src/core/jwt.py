@@ -1,10 +1,23 @@
+import hashlib
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from functools import cache
 
-from jose import jwt, JWTError
 from pydantic import BaseModel
 
 from src.core.interfaces.response import response
+from src.core.metrics import JWT_VERIFY_CACHED, JWT_VERIFY_FAILED, JWT_VERIFY_OK, register_cache
+from src.core.settings import settings
+from src.utils.cache import TTLCache
+
+
+@cache
+def _jose():
+    """首次签发/校验令牌时才导入 jose（连带 cryptography），缩短进程启动时间。"""
+    from jose import JWTError, jwt
+
+    return jwt, JWTError
 
 
 class TokenData(BaseModel):
@@ -88,16 +101,21 @@ class JWTTokenManager(TokenManager):
     使用JWT（JSON Web Tokens）的具体令牌管理器实现。
     """
 
-    def __init__(self):
+    def __init__(self, token_cache: TTLCache = None):
         """
         初始化JWT令牌管理器。
 
         设置密钥、算法和令牌过期时间。
+
+        Args:
+            token_cache (TTLCache): 可选的已验证令牌缓存，命中时跳过签名校验。
+                缓存条目的过期时间不会晚于令牌自身的 exp。
         """
         self.SECRET_KEY = "your-secret-key"  # 在实际应用中应使用环境变量或配置文件
         self.ALGORITHM = "HS256"
         self.ACCESS_TOKEN_EXPIRE_MINUTES = 30
         self.REFRESH_TOKEN_EXPIRE_DAYS = 7
+        self.token_cache = token_cache
 
     def create_access_token(self, data: dict) -> str:
         """
@@ -109,6 +127,7 @@ class JWTTokenManager(TokenManager):
         Returns:
             str: 生成的JWT访问令牌。
         """
+        jwt, _ = _jose()
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode.update({"exp": expire})
@@ -125,6 +144,7 @@ class JWTTokenManager(TokenManager):
         Returns:
             str: 生成的JWT刷新令牌。
         """
+        jwt, _ = _jose()
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
         to_encode.update({"exp": expire})
@@ -144,15 +164,29 @@ class JWTTokenManager(TokenManager):
         Raises:
             ValueError: 如果令牌无效或无法验证。
         """
+        if self.token_cache is not None:
+            cache_key = hashlib.sha256(token.encode()).digest()
+            token_data = self.token_cache.get(cache_key)
+            if token_data is not None:
+                JWT_VERIFY_CACHED.inc()
+                return token_data
+
+        jwt, JWTError = _jose()
         try:
             payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
             username: str = payload.get("sub")
             if username is None:
+                JWT_VERIFY_FAILED.inc()
                 raise ValueError("令牌无效")
                 # raise response(code=401, message="令牌无效")
             token_data = TokenData(username=username)
+            JWT_VERIFY_OK.inc()
+            if self.token_cache is not None and "exp" in payload:
+                # 缓存条目最晚在令牌过期时失效
+                self.token_cache.set(cache_key, token_data, ttl=payload["exp"] - time.time())
             return token_data
         except JWTError as e:
+            JWT_VERIFY_FAILED.inc()
             # raise ValueError("无法验证凭据")
             raise response(code=401, message=f"无法验证凭据 - {e}")
 
@@ -169,6 +203,7 @@ class JWTTokenManager(TokenManager):
         Raises:
             ValueError: 如果刷新令牌无效或无法验证。
         """
+        jwt, JWTError = _jose()
         try:
             payload = jwt.decode(refresh_token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
             username: str = payload.get("sub")
@@ -183,6 +218,15 @@ class JWTTokenManager(TokenManager):
             # raise response(code=500, message="无法验证刷新令牌")
 
 
+def create_token_manager() -> JWTTokenManager:
+    """根据配置创建令牌管理器，settings.cache.jwt_size 大于0时启用已验证令牌缓存。"""
+    cache = settings.cache
+    token_cache = TTLCache(maxsize=cache.jwt_size, ttl=cache.jwt_ttl) if cache.jwt_size > 0 else None
+    if token_cache is not None:
+        register_cache("jwt", token_cache)
+    return JWTTokenManager(token_cache=token_cache)
+
+
 class RefreshTokenRequest(BaseModel):
     """
     定义刷新令牌请求的数据结构。
@@ -1,49 +1,170 @@
+"""
+路由加载
+
+控制器类使用 @controller 注册，register_routes 导入 src/modules 下的 *_controller.py 后只实例化已注册的类。
+未使用 @controller 的模块仍然兼容：只考虑模块内定义的类，实例化第一个带 router 属性的类。
+
+部署时可以预先生成路由清单，启动时按清单直接导入，不再扫描目录：
+
+    python -m src.core.load_routers routes_manifest.json
+    APP_ROUTES_MANIFEST=routes_manifest.json
+"""
 import importlib
+import importlib.util
+import json
 import os
 import sys
 import traceback
+from collections import defaultdict
 
 from fastapi import FastAPI
 
+from src.core.settings import settings
+
 MODULES_DIR = "src.modules"
 
+# 已注册的控制器 {模块名: [控制器类]}
+_controllers: dict = defaultdict(list)
 
-def register_routes(app: FastAPI):
-    modules_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "modules")
-    print('♻️ 开始扫描路由')
 
-    if not os.path.exists(modules_path):
-        raise FileNotFoundError(f"❌ 未找到路径: {modules_path}")
-
-    for module_name in os.listdir(modules_path):
-        module_path = os.path.join(modules_path, module_name)
-
-        if os.path.isdir(module_path) and not module_name.startswith("__"):
-            for file_name in os.listdir(module_path):
-                if file_name.endswith("_controller.py"):
-                    module_file = file_name[:-3]  # 去掉 ".py" 后缀
-                    full_module_name = f"{MODULES_DIR}.{module_name}.{module_file}"
-                    try:
-                        controller_module = importlib.import_module(full_module_name)
-                        # 检查控制器类是否有 router 属性
-                        for attr_name in dir(controller_module):
-                            attr_value = getattr(controller_module, attr_name)
-                            if isinstance(attr_value, type):  # 检查是否为类
-                                instance = attr_value()
-                                if hasattr(instance, "router"):
-                                    app.include_router(instance.router)
-                                    print(f"{module_name}.{module_file} ✅.")
-                                    break  # 找到一个 router 就退出循环
-                    except Exception as e:
-                        error_info = get_error_info(sys.exc_info()[2], full_module_name)
-                        print(f"注册模块 '{module_name}.{module_file}' 时发生错误 ❌ {type(e).__name__}:")
-                        if error_info:
-                            print(f"  文件: {error_info['filename']}")
-                            print(f"  行号: {error_info['lineno']}")
-                        else:
-                            print(f"  模块: {full_module_name}")
-                        print(f"  错误信息: {str(e)}")
-                        print(f"  堆栈跟踪:\n{traceback.format_exc()}")
+def controller(cls):
+    """
+    注册控制器类。
+
+    被注册的类在 register_routes 中实例化，并把实例的 router 挂载到应用上。
+    """
+    _controllers[cls.__module__].append(cls)
+    return cls
+
+
+def scan_controller_modules(package: str = MODULES_DIR) -> list:
+    """
+    扫描包下各模块目录中的 *_controller.py。
+
+    Returns:
+        list: 控制器模块的完整模块名，按名称排序。
+    """
+    spec = importlib.util.find_spec(package)
+    if spec is None or not spec.submodule_search_locations:
+        raise FileNotFoundError(f"❌ 未找到路径: {package}")
+    modules_path = spec.submodule_search_locations[0]
+
+    module_names = []
+    with os.scandir(modules_path) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if not entry.is_dir() or entry.name.startswith("__"):
+                continue
+            with os.scandir(entry.path) as files:
+                for file in sorted(files, key=lambda f: f.name):
+                    if file.name.endswith("_controller.py"):
+                        module_names.append(f"{package}.{entry.name}.{file.name[:-3]}")
+    return module_names
+
+
+def find_controllers(module) -> list:
+    """
+    返回模块中的控制器类。
+
+    优先使用 @controller 注册的类；未注册时只考虑模块内定义的类（排除导入的 APIRouter、Service、模型等）。
+    """
+    registered = _controllers.get(module.__name__)
+    if registered:
+        return list(registered)
+    return [
+        value for value in vars(module).values()
+        if isinstance(value, type) and value.__module__ == module.__name__
+    ]
+
+
+def _include(app: FastAPI, cls) -> bool:
+    instance = cls()
+    router = getattr(instance, "router", None)
+    if router is None:
+        return False
+    app.include_router(router)
+    return True
+
+
+def _register_module(app: FastAPI, module_name: str, class_names: list | None = None):
+    try:
+        module = importlib.import_module(module_name)
+        if class_names is not None:
+            for name in class_names:
+                _include(app, getattr(module, name))
+        elif module.__name__ in _controllers:
+            for cls in _controllers[module.__name__]:
+                _include(app, cls)
+        else:
+            # 未使用 @controller 的模块保持原有行为：找到一个 router 就停止
+            for cls in find_controllers(module):
+                if _include(app, cls):
+                    break
+        print(f"{module_name.removeprefix(MODULES_DIR + '.')} ✅.")
+    except Exception as e:
+        error_info = get_error_info(sys.exc_info()[2], module_name)
+        print(f"注册模块 '{module_name}' 时发生错误 ❌ {type(e).__name__}:")
+        if error_info:
+            print(f"  文件: {error_info['filename']}")
+            print(f"  行号: {error_info['lineno']}")
+        else:
+            print(f"  模块: {module_name}")
+        print(f"  错误信息: {str(e)}")
+        print(f"  堆栈跟踪:\n{traceback.format_exc()}")
+
+
+def load_manifest(path: str) -> list:
+    """
+    读取路由清单。
+
+    Returns:
+        list: [(模块名, [控制器类名])]
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [(item["module"], item["controllers"]) for item in data["modules"]]
+
+
+def write_manifest(path: str, package: str = MODULES_DIR) -> list:
+    """
+    扫描并导入所有控制器模块，生成路由清单。
+
+    Returns:
+        list: 写入清单的条目。
+    """
+    modules = []
+    for module_name in scan_controller_modules(package):
+        module = importlib.import_module(module_name)
+        classes = find_controllers(module)
+        if module_name not in _controllers:
+            classes = [cls for cls in classes if hasattr(cls(), "router")][:1]
+        classes = [cls.__name__ for cls in classes]
+        modules.append({"module": module_name, "controllers": classes})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"modules": modules}, f, ensure_ascii=False, indent=2)
+    return modules
+
+
+def register_routes(app: FastAPI, manifest: str | None = None, package: str = MODULES_DIR):
+    """
+    注册所有控制器的路由。
+
+    Args:
+        app (FastAPI): 应用实例。
+        manifest (str): 路由清单路径，默认 settings.routes_manifest，文件不存在时回退到目录扫描。
+        package (str): 控制器所在的包。
+    """
+    manifest = settings.routes_manifest if manifest is None else manifest
+    if manifest and os.path.exists(manifest):
+        print(f'♻️ 按路由清单 {manifest} 注册路由')
+        for module_name, class_names in load_manifest(manifest):
+            _register_module(app, module_name, class_names)
+        return
+
+    if manifest:
+        print(f'⚠️ 未找到路由清单 {manifest}，改为扫描目录')
+    print('♻️ 开始扫描路由')
+    for module_name in scan_controller_modules(package):
+        _register_module(app, module_name)
 
 
 def get_error_info(tb, full_module_name):
@@ -55,4 +176,13 @@ def get_error_info(tb, full_module_name):
                 'lineno': tb.tb_lineno
             }
         tb = tb.tb_next
-    return None
\ No newline at end of file
+    return None
+
+
+if __name__ == "__main__":
+    # 控制器注册到 src.core.load_routers 模块，而不是以脚本运行的 __main__
+    from src.core.load_routers import write_manifest as _write_manifest
+
+    output = sys.argv[1] if len(sys.argv) > 1 else "routes_manifest.json"
+    entries = _write_manifest(output)
+    print(f"已写入 {output}，共 {len(entries)} 个控制器模块")
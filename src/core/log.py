@@ -1,18 +1,83 @@
+import random
+import time
+from bisect import bisect_left
 from functools import wraps
 
 from .log_config import api_logger, error_logger
+from .settings import settings
+
+# 延迟直方图的桶上界（秒），最后一个桶收集所有更慢的调用
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, float("inf"))
+
+
+class EndpointStats:
+    """单个接口的调用统计，只在事件循环线程内更新，无需加锁"""
+
+    __slots__ = ("calls", "errors", "total", "max", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def record(self, elapsed: float, error: bool = False):
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def to_dict(self) -> dict:
+        return dict(
+            calls=self.calls,
+            errors=self.errors,
+            avg_ms=self.total / self.calls * 1000 if self.calls else 0.0,
+            max_ms=self.max * 1000,
+            histogram={
+                ("+Inf" if bound == float("inf") else f"{bound * 1000:g}ms"): count
+                for bound, count in zip(LATENCY_BUCKETS, self.buckets)
+            },
+        )
+
+
+# 接口函数的 模块.限定名 -> 统计
+api_stats: dict = {}
+
+
+def api_stats_snapshot() -> dict:
+    """返回所有接口的调用统计"""
+    return {name: stats.to_dict() for name, stats in api_stats.items()}
 
 
 def log_api_call(func):
+    """
+    接口调用埋点。
+
+    每次调用只在内存中累计次数、错误数和延迟直方图；详细日志只记录按
+    settings.log.api_sample_rate 采样的调用，以及所有慢调用和失败调用。
+    统计按 模块.限定名 区分，不同模块中的同名函数不会合并。
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    stats = api_stats.setdefault(name, EndpointStats())
+
     @wraps(func)
     async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
         try:
-            api_logger.info(f"API call: {func.__name__}")
             result = await func(*args, **kwargs)
-            api_logger.info(f"API call completed: {func.__name__}")
-            return result
         except Exception as e:
-            error_logger.error(f"Error in {func.__name__}: {str(e)}")
+            elapsed = time.perf_counter() - start
+            stats.record(elapsed, error=True)
+            error_logger.error("Error in %s: %s (%.1f ms)", name, e, elapsed * 1000)
             raise
+        elapsed = time.perf_counter() - start
+        stats.record(elapsed)
+        if elapsed * 1000 >= settings.log.api_slow_ms or random.random() < settings.log.api_sample_rate:
+            api_logger.info("API call completed: %s (%.1f ms)", name, elapsed * 1000)
+        return result
 
     return wrapper
@@ -1,32 +1,196 @@
+import atexit
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
+
+from src.core.settings import settings
+
+# 日志配置过程本身的日志，由调用方（如 uvicorn/gunicorn）的日志配置决定是否输出
+logger = logging.getLogger(__name__)
+
+QUEUE_DROP = "drop"
+QUEUE_BLOCK = "block"
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出为一行JSON"""
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class BatchRotatingFileHandler(RotatingFileHandler):
+    """
+    按批刷新的 RotatingFileHandler。
+
+    每条日志写入后不立即刷新，由 BatchQueueListener 在一批写完后调用 flush_batch 统一刷新。
+    """
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    写入有界队列的日志处理器。
+
+    调用方线程只负责入队，格式化和文件写入都在后台线程完成。
+    队列满时按策略丢弃或阻塞等待，丢弃数量记录在 dropped 中。
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = QUEUE_DROP, block_timeout: float = 0.1):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record):
+        # 同进程内的线程队列无需序列化，格式化推迟到后台线程
+        return record
+
+    def enqueue(self, record):
+        try:
+            if self.policy == QUEUE_BLOCK:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchQueueListener:
+    """
+    后台日志线程。
+
+    从队列中一次取出最多 batch_size 条记录，交给对应记录器的处理器写入，每批结束后刷新一次文件。
+    """
+
+    _sentinel = None
+
+    def __init__(self, log_queue: queue.Queue, batch_size: int = 100):
+        self.queue = log_queue
+        self.batch_size = batch_size
+        self.handlers: dict = {}
+        self._thread: threading.Thread | None = None
+
+    def add_handler(self, logger_name: str, handler: logging.Handler):
+        self.handlers.setdefault(logger_name, []).append(handler)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """写完队列中剩余的日志后停止线程。"""
+        if self._thread is not None:
+            self.queue.put(self._sentinel)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = self._sentinel in batch
+            self._write([record for record in batch if record is not self._sentinel])
+            if stopping:
+                return
+
+    def _write(self, records: list):
+        touched = set()
+        for record in records:
+            for handler in self.handlers.get(record.name, ()):
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+                    touched.add(handler)
+        for handler in touched:
+            if isinstance(handler, BatchRotatingFileHandler):
+                handler.flush_batch()
+            else:
+                handler.flush()
+
+
+log_queue = queue.Queue(maxsize=settings.log.queue_size)
+log_listener = BatchQueueListener(log_queue, batch_size=settings.log.batch_size)
+
+# 日志器在导入时只创建，不挂处理器；文件和后台线程在 setup_logging 中初始化
+api_logger = logging.getLogger('api_logger')
+error_logger = logging.getLogger('error_logger')
+
+# {日志器名: (日志文件, 级别)}
+LOG_FILES = {
+    'api_logger': ('api.log', logging.INFO),
+    'error_logger': ('error.log', logging.ERROR),
+}
+
+_configured = False
 
 
 def setup_logger(name, log_file, level=logging.INFO):
     """函数设置任意多的记录器"""
 
-    formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+    if settings.log.json_lines:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
 
-    # 设置日志文件最大为1MB，保留5个旧文件
-    handler = RotatingFileHandler(log_file, maxBytes=1024 * 1024, backupCount=5)
+    # 设置日志文件最大为1MB，保留5个旧文件，文件写入在后台线程中完成
+    handler = BatchRotatingFileHandler(log_file, maxBytes=1024 * 1024, backupCount=5)
     handler.setFormatter(formatter)
+    log_listener.add_handler(name, handler)
+
+    named_logger = logging.getLogger(name)
+    named_logger.setLevel(level)
+    named_logger.addHandler(BoundedQueueHandler(log_queue, settings.log.queue_policy, settings.log.block_timeout))
+
+    logger.info("Logger '%s' 设置完成。日志文件: %s", name, log_file)
+    return named_logger
+
+
+def setup_logging():
+    """
+    创建日志目录、挂载日志文件并启动后台写入线程。
+
+    在应用 lifespan 启动时调用（gunicorn 下每个 worker 各自调用一次），重复调用只会重新启动已停止的后台线程。
+    """
+    global _configured
+    if not _configured:
+        _configured = True
 
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    logger.addHandler(handler)
+        # 确保日志目录存在
+        log_dir = settings.log.dir
+        os.makedirs(log_dir, exist_ok=True)
+        logger.info("已创建/检查日志目录: %s", log_dir)
 
-    print(f"Logger '{name}' 设置完成。日志文件: {log_file}")
-    return logger
+        for name, (file_name, level) in LOG_FILES.items():
+            setup_logger(name, os.path.join(log_dir, file_name), level=level)
 
+        # 进程退出前写完队列中的日志
+        atexit.register(log_listener.stop)
+        logger.info("记录器设置完成.")
 
-# 确保日志目录存在
-log_dir = "logs"
-os.makedirs(log_dir, exist_ok=True)
-print(f"已创建/检查日志目录: {log_dir}")
+    log_listener.start()
 
-# 创建不同的日志器
-api_logger = setup_logger('api_logger', os.path.join(log_dir, 'api.log'))
-error_logger = setup_logger('error_logger', os.path.join(log_dir, 'error.log'), level=logging.ERROR)
 
-print("记录器设置完成.")
+def shutdown_logging():
+    """写完队列中剩余的日志并停止后台线程。"""
+    log_listener.stop()
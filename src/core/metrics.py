@@ -0,0 +1,225 @@
+"""
+Prometheus 指标
+
+单进程时使用 prometheus_client 的默认注册表；gunicorn 多进程部署时设置环境变量
+PROMETHEUS_MULTIPROC_DIR 指向一个空目录，每个 worker 把指标写入各自的 mmap 文件，
+/metrics 读取时汇总所有 worker。worker 退出时需要调用 mark_process_dead 清理（见 src/serve.py）。
+连接池和缓存指标只能在所属进程内读取，多进程时每个 worker 在 lifespan 中启动定时刷新（start_gauge_refresh）。
+"""
+import asyncio
+import os
+import time
+from functools import wraps
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.log_config import error_logger
+from src.core.settings import settings
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP 请求数", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP 请求耗时", ["method", "route"]
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "处理中的 HTTP 请求数", multiprocess_mode="livesum"
+)
+
+DB_QUERIES = Counter(
+    "db_queries_total", "DbHelper 查询次数", ["model", "operation", "result"]
+)
+DB_LATENCY = Histogram(
+    "db_query_duration_seconds", "DbHelper 查询耗时", ["model", "operation"]
+)
+DB_POOL = Gauge(
+    "db_pool_connections", "连接池连接数", ["connection", "state"], multiprocess_mode="livesum"
+)
+DB_POOL_WAIT = Gauge(
+    "db_pool_wait_avg_seconds", "获取连接的平均等待时间", ["connection"], multiprocess_mode="max"
+)
+
+PASSWORD_HASH_QUEUE = Histogram(
+    "password_hash_queue_seconds", "密码哈希排队等待时间",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "因队列已满被拒绝的密码哈希请求数"
+)
+
+JWT_VERIFY = Counter(
+    "jwt_verify_total", "JWT 校验次数", ["result"]
+)
+JWT_VERIFY_OK = JWT_VERIFY.labels("ok")
+JWT_VERIFY_CACHED = JWT_VERIFY.labels("cached")
+JWT_VERIFY_FAILED = JWT_VERIFY.labels("failed")
+
+RATE_LIMITED = Counter(
+    "rate_limited_total", "被限流拒绝的请求数", ["limiter"]
+)
+
+CACHE_EVENTS = Gauge(
+    "cache_events", "进程内缓存累计命中/未命中/淘汰次数", ["cache", "event"], multiprocess_mode="livesum"
+)
+CACHE_SIZE = Gauge(
+    "cache_size", "进程内缓存条目数", ["cache"], multiprocess_mode="livesum"
+)
+
+# 抓取时刷新的指标来源 {缓存名: TTLCache 或返回 TTLCache 的函数}
+_caches: dict = {}
+
+
+def register_cache(name: str, cache):
+    """注册进程内缓存，抓取 /metrics 时导出其统计。"""
+    _caches[name] = cache
+
+
+def track_db(operation: str):
+    """
+    DbHelper 方法埋点，按模型和操作记录次数、耗时和失败数。
+
+    Args:
+        operation (str): 操作名，如 select/update/insert。
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            model = getattr(self, "model", None)
+            model_name = model.__name__ if model is not None else "raw"
+            start = time.perf_counter()
+            result = "error"
+            try:
+                value = await func(self, *args, **kwargs)
+                result = "ok"
+                return value
+            finally:
+                DB_QUERIES.labels(model_name, operation, result).inc()
+                DB_LATENCY.labels(model_name, operation).observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    纯ASGI的 HTTP 指标中间件。
+
+    按路由模板（如 /user/{id}）而不是实际路径统计，避免标签数量随路径参数膨胀。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_LATENCY.labels(scope["method"], template).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(scope["method"], template, str(status)).inc()
+
+
+def _refresh_gauges():
+    """刷新连接池与缓存等按需读取的指标。"""
+    from src.core.db_backend import pool_stats
+
+    for name, stats in pool_stats().items():
+        DB_POOL.labels(name, "in_use").set(stats["in_use"])
+        DB_POOL.labels(name, "idle").set(stats["idle"])
+        DB_POOL.labels(name, "waiters").set(stats["waiters"])
+        DB_POOL.labels(name, "max").set(stats["maxsize"])
+        DB_POOL_WAIT.labels(name).set(stats["wait_avg_ms"] / 1000)
+
+    for name, cache in _caches.items():
+        cache = cache() if callable(cache) else cache
+        if cache is None:
+            continue
+        stats = cache.stats()
+        CACHE_SIZE.labels(name).set(stats["size"])
+        for event in ("hits", "misses", "evictions"):
+            CACHE_EVENTS.labels(name, event).set(stats[event])
+
+
+async def _run_gauge_refresh(interval: float):
+    while True:
+        try:
+            _refresh_gauges()
+        except Exception as e:
+            error_logger.error(f"刷新指标失败: {e}")
+        await asyncio.sleep(interval)
+
+
+_refresh_task: asyncio.Task | None = None
+
+
+def start_gauge_refresh(interval: float = None):
+    """
+    多进程模式下启动本 worker 的指标定时刷新，单进程时在抓取时刷新，不需要后台任务。
+
+    Args:
+        interval (float): 刷新间隔（秒），默认 settings.metrics_refresh_interval。
+    """
+    global _refresh_task
+    if MULTIPROCESS and _refresh_task is None:
+        _refresh_task = asyncio.create_task(_run_gauge_refresh(interval or settings.metrics_refresh_interval))
+
+
+def stop_gauge_refresh():
+    """停止指标定时刷新。"""
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        _refresh_task = None
+
+
+def mark_process_dead(pid: int):
+    """多进程模式下 worker 退出时清理其 livesum 指标。"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
+
+
+def render_metrics() -> tuple:
+    """
+    生成 Prometheus 文本格式的指标。
+
+    Returns:
+        tuple: (内容, Content-Type)
+    """
+    # 多进程时其他 worker 的指标由各自的定时任务刷新，这里刷新当前 worker 以免抓取到过期值
+    _refresh_gauges()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,240 @@
+"""
+限流
+
+RateLimitBackend 定义计数存储接口，默认的 MemoryRateLimitBackend 在进程内按滑动窗口计数；
+多实例部署需要共享计数时，实现同样接口的 Redis 等存储并在 container.rate_limit_backend 中替换即可。
+
+- RateLimitMiddleware 按客户端IP限制登录/获取token接口的请求频率。
+- UserService.authenticate_user 按用户名限制登录尝试次数（登录成功后清零），超限时在查库和密码哈希之前直接拒绝。
+"""
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from fastapi import status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.interfaces.response import response
+from src.core.metrics import RATE_LIMITED
+from src.core.settings import settings
+
+
+class RateLimitResult(NamedTuple):
+    """限流结果"""
+
+    allowed: bool
+    # 窗口内剩余可用次数
+    remaining: int
+    # 被拒绝时建议的重试等待时间（秒）
+    retry_after: float
+
+
+class RateLimitBackend(ABC):
+    """
+    限流计数存储的抽象基类。
+
+    接口为异步方法，便于替换为需要网络访问的共享存储。
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float, cost: int = 1) -> RateLimitResult:
+        """
+        记录一次请求并判断是否超限，超限时不计数。
+
+        Args:
+            key (str): 计数键。
+            limit (int): 窗口内允许的最大次数。
+            window (float): 窗口长度（秒）。
+            cost (int): 本次请求消耗的次数。
+
+        Returns:
+            RateLimitResult: 是否允许、剩余次数和重试等待时间。
+        """
+        pass
+
+    @abstractmethod
+    async def reset(self, key: str):
+        """清除计数。"""
+        pass
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    进程内滑动窗口计数存储。
+
+    每个键只保存 [当前窗口起点, 上一窗口计数, 当前窗口计数] 三个值，按上一窗口剩余的时间比例加权估算
+    滑动窗口内的请求数。窗口在访问时惰性滚动，不需要后台清理；键数量超过 max_keys 时淘汰最久未访问的键。
+    只在单个事件循环线程内使用，不加锁。
+    """
+
+    def __init__(self, max_keys: int = settings.rate_limit.max_keys):
+        """
+        Args:
+            max_keys (int): 最多保存的键数量。
+        """
+        self.max_keys = max_keys
+        self._windows: OrderedDict[str, list] = OrderedDict()
+        self.evictions = 0
+
+    def _window(self, key: str, window: float, now: float) -> list:
+        """取出键对应的计数并滚动到当前窗口，不存在时创建。"""
+        start = now - now % window
+        item = self._windows.get(key)
+        if item is None:
+            item = self._windows[key] = [start, 0, 0]
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+                self.evictions += 1
+        elif item[0] != start:
+            # 紧邻的上一个窗口保留计数用于加权，更早的窗口已经完全过期
+            item[1] = item[2] if start - item[0] == window else 0
+            item[2] = 0
+            item[0] = start
+        self._windows.move_to_end(key)
+        return item
+
+    @staticmethod
+    def _count(item: list, window: float, now: float) -> float:
+        return item[1] * (1 - (now - item[0]) / window) + item[2]
+
+    @staticmethod
+    def _retry_after(item: list, limit: int, window: float, now: float, cost: int) -> float:
+        elapsed = now - item[0]
+        if item[2] + cost > limit:
+            # 仅当前窗口就已超限，需要等到下一个窗口
+            return window - elapsed
+        # 等待上一窗口的权重衰减到足以容纳本次请求
+        return max(window * (1 - (limit - item[2] - cost) / item[1]) - elapsed, 0.0)
+
+    async def hit(self, key: str, limit: int, window: float, cost: int = 1) -> RateLimitResult:
+        now = time.monotonic()
+        item = self._window(key, window, now)
+        count = self._count(item, window, now)
+        if count + cost > limit:
+            return RateLimitResult(False, 0, self._retry_after(item, limit, window, now, cost))
+        item[2] += cost
+        return RateLimitResult(True, int(limit - count - cost), 0.0)
+
+    async def reset(self, key: str):
+        self._windows.pop(key, None)
+
+    def __len__(self):
+        return len(self._windows)
+
+
+class RateLimiter:
+    """
+    一类限流规则，如按IP或按用户名。
+
+    同一个存储可以被多个限流器共享，计数键以限流器名称作为前缀。
+    """
+
+    def __init__(self, backend: RateLimitBackend, name: str, limit: int, window: float):
+        """
+        Args:
+            backend (RateLimitBackend): 计数存储。
+            name (str): 限流器名称，用作键前缀和指标标签。
+            limit (int): 窗口内允许的最大次数。
+            window (float): 窗口长度（秒）。
+        """
+        self.backend = backend
+        self.name = name
+        self.limit = limit
+        self.window = window
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        """记录一次请求，超限时返回 allowed=False。"""
+        result = await self.backend.hit(self._key(key), self.limit, self.window, cost)
+        if not result.allowed:
+            RATE_LIMITED.labels(self.name).inc()
+        return result
+
+    async def reset(self, key: str):
+        await self.backend.reset(self._key(key))
+
+
+def create_ip_rate_limiter(backend: RateLimitBackend) -> RateLimiter | None:
+    """按配置创建IP限流器，未启用限流时返回None。"""
+    config = settings.rate_limit
+    if not config.enabled:
+        return None
+    return RateLimiter(backend, "ip", config.ip_limit, config.ip_window)
+
+
+def create_login_rate_limiter(backend: RateLimitBackend) -> RateLimiter | None:
+    """按配置创建用户名登录失败限流器，未启用限流时返回None。"""
+    config = settings.rate_limit
+    if not config.enabled:
+        return None
+    return RateLimiter(backend, "login", config.username_limit, config.username_window)
+
+
+def username_key(username: str) -> str:
+    """
+    按用户名限流的计数键。
+
+    用户名查询使用 MySQL 大小写不敏感的排序规则，alice/Alice/ALICE 是同一个账号，需要归一化为同一个键。
+    """
+    return username.strip().casefold()
+
+
+def too_many_requests(result: RateLimitResult):
+    """超限时的 429 响应，带 Retry-After 头。"""
+    error = response(code=status.HTTP_429_TOO_MANY_REQUESTS, message="请求过于频繁，请稍后重试")
+    error.headers["Retry-After"] = str(max(math.ceil(result.retry_after), 1))
+    return error
+
+
+def client_ip(scope: Scope) -> str:
+    """
+    请求的客户端IP。
+
+    trust_forwarded 开启时取 X-Forwarded-For 从右数第 forwarded_hops 个地址，即最外层可信代理追加的地址；
+    左侧的地址可以由客户端任意伪造，不能使用。地址数量不足时使用连接的对端地址。
+    """
+    config = settings.rate_limit
+    if config.trust_forwarded:
+        forwarded = Headers(scope=scope).getlist("x-forwarded-for")
+        addresses = [address.strip() for value in forwarded for address in value.split(",")]
+        if len(addresses) >= config.forwarded_hops:
+            return addresses[-config.forwarded_hops]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    按客户端IP限流的纯ASGI中间件。
+
+    只对 settings.rate_limit.paths 中的路径计数，其他请求直接放行。
+    """
+
+    def __init__(self, app: ASGIApp, limiter: Callable[[], RateLimiter | None], paths: list = None):
+        """
+        Args:
+            app (ASGIApp): 下一层应用。
+            limiter: 返回限流器的函数，通常是 container.ip_rate_limiter。
+            paths (list): 需要限流的路径，默认 settings.rate_limit.paths。
+        """
+        self.app = app
+        self.limiter = limiter
+        self.paths = frozenset(settings.rate_limit.paths if paths is None else paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] not in self.paths or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiter()
+        if limiter is not None:
+            result = await limiter.hit(client_ip(scope))
+            if not result.allowed:
+                await too_many_requests(result)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
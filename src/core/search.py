@@ -0,0 +1,340 @@
+"""查询字段的搜索方式与可插拔的全文搜索引擎"""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import timedelta
+from functools import partial
+
+from tortoise import timezone
+
+from src.core.dbhelper import DbHelper
+
+# 字段匹配方式
+SEARCH_CONTAINS = "contains"  # LIKE '%v%'，无法使用索引，未配置字段的默认行为
+SEARCH_PREFIX = "prefix"  # LIKE 'v%'，可以使用普通索引
+SEARCH_EXACT = "exact"  # 等值匹配
+SEARCH_FULLTEXT = "fulltext"  # 交给搜索引擎
+
+
+def build_search_filters(values: dict, search_fields: dict) -> tuple:
+    """
+    根据字段匹配方式生成查询条件
+    :param values: 查询参数 {"name": "7y"}，值为None的字段忽略
+    :param search_fields: 字段匹配方式 {"name": "prefix"}，未配置的字段使用 contains
+    :return: (ORM条件, 全文搜索字段)
+    """
+    filters, fulltext = {}, {}
+    for field, value in values.items():
+        if value is None:
+            continue
+        mode = search_fields.get(field, SEARCH_CONTAINS)
+        if mode == SEARCH_EXACT:
+            filters[field] = value
+        elif mode == SEARCH_PREFIX:
+            filters[f"{field}__startswith"] = value
+        elif mode == SEARCH_FULLTEXT:
+            fulltext[field] = value
+        else:
+            filters[f"{field}__contains"] = value
+    return filters, fulltext
+
+
+class SearchEngine(ABC):
+    """
+    全文搜索引擎的抽象基类。
+
+    根据全文搜索字段返回额外的ORM查询条件，通常是候选主键 {"id__in": [...]}。
+    """
+
+    @abstractmethod
+    async def filters(self, model, terms: dict) -> dict:
+        """
+        生成全文搜索条件。
+
+        Args:
+            model: 模型类 orm model。
+            terms (dict): 全文搜索字段 {"title": "关键字"}。
+
+        Returns:
+            dict: 合并到查询中的ORM条件。
+        """
+        pass
+
+
+class ContainsSearchEngine(SearchEngine):
+    """不使用索引，退化为 LIKE '%v%'。"""
+
+    async def filters(self, model, terms: dict) -> dict:
+        return {f"{field}__contains": value for field, value in terms.items()}
+
+
+class MySQLFullTextEngine(SearchEngine):
+    """
+    使用MySQL FULLTEXT索引的搜索引擎。
+
+    中文需要使用ngram解析器建立索引，建表后执行 index_sql 生成的语句即可。
+    """
+
+    def __init__(self, max_results: int = 10000):
+        """
+        Args:
+            max_results (int): 单次搜索返回的最大候选主键数量。
+        """
+        self.max_results = max_results
+        self._indexed_columns: dict = {}
+
+    @staticmethod
+    def index_sql(model, field: str) -> str:
+        """生成为字段添加 ngram FULLTEXT 索引的DDL。"""
+        table = model._meta.db_table
+        column = model._meta.fields_db_projection[field]
+        return f"ALTER TABLE `{table}` ADD FULLTEXT INDEX `ft_{table}_{column}` (`{column}`) WITH PARSER ngram"
+
+    async def indexed_columns(self, model) -> set:
+        """查询模型表上已建立FULLTEXT索引的列，结果按模型缓存。"""
+        if model not in self._indexed_columns:
+            columns = set()
+            db = model._meta.db
+            if db.capabilities.dialect == "mysql":
+                rows = await db.execute_query_dict(
+                    "SELECT COLUMN_NAME AS name FROM information_schema.STATISTICS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_TYPE = 'FULLTEXT'",
+                    [model._meta.db_table],
+                )
+                columns = {row["name"] for row in rows}
+            self._indexed_columns[model] = columns
+        return self._indexed_columns[model]
+
+    async def available(self, model, fields) -> bool:
+        columns = await self.indexed_columns(model)
+        return all(model._meta.fields_db_projection[field] in columns for field in fields)
+
+    async def filters(self, model, terms: dict) -> dict:
+        projection = model._meta.fields_db_projection
+        # 使用短语搜索，与 contains 的语义最接近
+        where = " AND ".join(f"MATCH(`{projection[field]}`) AGAINST(%s IN BOOLEAN MODE)" for field in terms)
+        args = ['"{}"'.format(str(value).replace('"', " ")) for value in terms.values()]
+        # 多取一条用于判断是否超过上限
+        sql = f"SELECT `{model._meta.db_pk_column}` AS pk FROM `{model._meta.db_table}` WHERE {where} LIMIT %s"
+        rows = await model._meta.db.execute_query_dict(sql, args + [self.max_results + 1])
+        if len(rows) > self.max_results:
+            # 候选主键被截断时结果和总数都会偏小，退化为 contains 由数据库完整匹配
+            return {f"{field}__contains": value for field, value in terms.items()}
+        return {"id__in": [row["pk"] for row in rows]}
+
+
+class InvertedIndexEngine(SearchEngine):
+    """
+    进程内的倒排索引搜索引擎。
+
+    以小写字符二元组(bigram)为词项，中英文都能做子串匹配。索引只是缩小候选范围的提示，最终结果仍由数据库
+    按 contains 条件校验，索引中残留的旧数据不会影响正确性；缺少的数据则会被漏掉，因此：
+
+    - 首次搜索时在后台任务中分批构建索引，构建完成前退化为 contains 查询，不阻塞请求；
+      也可以在 lifespan 中提前调用 build 预热。
+    - 本进程经 DbHelper 的写操作通过监听器增量维护。
+    - 其他 worker 的写入和不经过 DbHelper 的写入（如 Model.create）在搜索时补齐：每隔 refresh_interval 秒
+      按 id > 已索引的最大主键读取新增行，并按 modified 读取最近更新的行，最多有 refresh_interval 秒的延迟。
+      不更新 modified 的批量 update 无法感知，需要调用 invalidate 丢弃索引。
+
+    有延迟且每个进程各自占用内存，不作为默认的搜索引擎，需要时赋值给 Service.search_engine。
+    """
+
+    def __init__(self, max_candidates: int = 10000, build_chunk_size: int = 10000, refresh_interval: float = 5):
+        """
+        Args:
+            max_candidates (int): 候选主键超过该数量时放弃索引，退化为 contains 查询。
+            build_chunk_size (int): 构建索引时每批读取的行数。
+            refresh_interval (float): 搜索时补齐其他来源写入的最小间隔（秒）。
+        """
+        self.max_candidates = max_candidates
+        self.build_chunk_size = build_chunk_size
+        self.refresh_interval = refresh_interval
+        # {(模型类, 字段): {词项: {主键}}}
+        self._postings: dict = {}
+        # {模型类: 已建立索引的最大主键}
+        self._max_pk: dict = {}
+        # {模型类: 上次补齐开始的时间}
+        self._refreshed_at: dict = {}
+        # {模型类: 上次补齐开始时的数据库时间，与 auto_now 写入的 modified 时区语义一致}
+        self._modified_since: dict = {}
+        self._locks: dict = defaultdict(asyncio.Lock)
+        self._listening: set = set()
+        # 正在构建索引的模型，构建完成前搜索不使用索引
+        self._building: set = set()
+        # {模型类: 后台构建任务}
+        self._tasks: dict = {}
+
+    @staticmethod
+    def tokenize(value) -> set:
+        text = str(value).lower()
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    def _add(self, model, field: str, pk, value):
+        if value is None:
+            return
+        postings = self._postings[(model, field)]
+        for token in self.tokenize(value):
+            postings[token].add(pk)
+
+    async def _index_rows(self, model, fields, queryset):
+        """分批读取数据加入索引，按主键递增遍历。"""
+        last_pk = self._max_pk.get(model, 0)
+        while True:
+            rows = await queryset.filter(id__gt=last_pk).order_by("id").limit(self.build_chunk_size).values(
+                "id", *fields
+            )
+            if not rows:
+                break
+            for row in rows:
+                for field in fields:
+                    self._add(model, field, row["id"], row[field])
+            last_pk = rows[-1]["id"]
+        self._max_pk[model] = max(self._max_pk.get(model, 0), last_pk)
+
+    async def build(self, model, fields):
+        """
+        为模型字段构建索引并注册写操作监听器，已构建的字段直接返回。
+
+        Args:
+            model: 模型类 orm model。
+            fields: 需要建立索引的字段。
+        """
+        missing = [field for field in fields if (model, field) not in self._postings]
+        if not missing:
+            return
+        async with self._locks[model]:
+            missing = [field for field in fields if (model, field) not in self._postings]
+            if not missing:
+                return
+            if model not in self._listening:
+                # 先注册监听器，构建期间的写入不会遗漏
+                DbHelper.add_listener(model, partial(self._on_write, model))
+                self._listening.add(model)
+            for field in missing:
+                self._postings[(model, field)] = defaultdict(set)
+            # 新字段需要从头构建
+            indexed_pk = self._max_pk.pop(model, 0)
+            self._refreshed_at[model] = time.time()
+            self._modified_since[model] = timezone.now()
+            self._building.add(model)
+            try:
+                await self._index_rows(model, missing, model.all())
+            except BaseException:
+                for field in missing:
+                    self._postings.pop((model, field), None)
+                raise
+            finally:
+                self._building.discard(model)
+                self._max_pk[model] = max(self._max_pk.get(model, 0), indexed_pk)
+
+    def _ready(self, model, fields) -> bool:
+        """字段的索引是否已构建完成，未完成时启动后台构建。"""
+        if model in self._building:
+            return False
+        if all((model, field) in self._postings for field in fields):
+            return True
+        task = self._tasks.get(model)
+        if task is None or task.done():
+            self._tasks[model] = asyncio.create_task(self.build(model, fields))
+        return False
+
+    async def refresh(self, model, force: bool = False):
+        """
+        补齐其他进程或绕过 DbHelper 的写入：读取主键大于已索引最大主键的新增行，以及 modified 在上次补齐之后的行。
+
+        Args:
+            model: 模型类 orm model。
+            force (bool): 忽略 refresh_interval 立即补齐。
+        """
+        fields = self._fields(model)
+        if not fields or (not force and time.time() - self._refreshed_at.get(model, 0) < self.refresh_interval):
+            return
+        async with self._locks[model]:
+            since = self._refreshed_at.get(model, 0)
+            now = time.time()
+            if not force and now - since < self.refresh_interval:
+                return
+            self._refreshed_at[model] = now
+            modified_since = self._modified_since.get(model)
+            self._modified_since[model] = timezone.now()
+            await self._index_rows(model, fields, model.all())
+            if "modified" in model._meta.fields_map and modified_since is not None:
+                # 多回看一个间隔，覆盖进程间的时钟误差和写入到提交之间的时间差
+                modified_after = modified_since - timedelta(seconds=self.refresh_interval)
+                rows = await model.filter(modified__gte=modified_after).values("id", *fields)
+                for row in rows:
+                    for field in fields:
+                        self._add(model, field, row["id"], row[field])
+
+    def invalidate(self, model):
+        """丢弃模型的索引，下次搜索时在后台重新构建。"""
+        for field in self._fields(model):
+            self._postings.pop((model, field), None)
+        self._max_pk.pop(model, None)
+        self._refreshed_at.pop(model, None)
+        self._modified_since.pop(model, None)
+
+    def _fields(self, model) -> list:
+        return [field for (m, field) in self._postings if m is model]
+
+    async def _on_write(self, model, action: str, filters: dict = None, data=None):
+        """DbHelper 写操作后增量更新索引。"""
+        fields = self._fields(model)
+        if not fields:
+            return
+        if action == "insert":
+            for field in fields:
+                self._add(model, field, data.pk, getattr(data, field))
+        elif action == "inserts":
+            # 批量新增时数据库不一定回填主键，按主键增量补齐
+            async with self._locks[model]:
+                await self._index_rows(model, fields, model.all())
+        elif action == "update" and filters:
+            # 按主键更新时只重建这些行的词项，旧词项由数据库 contains 条件兜底；
+            # 无法定位行时丢弃该模型的索引，下次搜索时重新构建
+            pks = filters.get("id__in") or ([filters["id"]] if "id" in filters else None)
+            if pks is None:
+                self.invalidate(model)
+                return
+            for row in await model.filter(id__in=pks).values("id", *fields):
+                for field in fields:
+                    self._add(model, field, row["id"], row[field])
+
+    async def filters(self, model, terms: dict) -> dict:
+        filters = {f"{field}__contains": value for field, value in terms.items()}
+        if not self._ready(model, list(terms)):
+            return filters
+        await self.refresh(model)
+        candidates = None
+        for field, value in terms.items():
+            tokens = self.tokenize(value)
+            if not tokens:
+                # 单个字符无法用 bigram 缩小范围
+                continue
+            postings = self._postings[(model, field)]
+            matched = set.intersection(*(postings.get(token, set()) for token in tokens))
+            candidates = matched if candidates is None else candidates & matched
+        if candidates is not None and len(candidates) <= self.max_candidates:
+            filters["id__in"] = list(candidates)
+        return filters
+
+
+class AutoSearchEngine(SearchEngine):
+    """
+    自动选择搜索引擎：字段都有MySQL FULLTEXT索引时使用数据库全文搜索，否则使用 fallback，默认 contains。
+    """
+
+    def __init__(self, fulltext: MySQLFullTextEngine = None, fallback: SearchEngine = None):
+        self.fulltext = fulltext or MySQLFullTextEngine()
+        self.fallback = fallback or ContainsSearchEngine()
+
+    async def filters(self, model, terms: dict) -> dict:
+        if await self.fulltext.available(model, terms):
+            return await self.fulltext.filters(model, terms)
+        return await self.fallback.filters(model, terms)
+
+
+# Service 默认使用的搜索引擎
+default_search_engine = AutoSearchEngine()
@@ -1,6 +1,12 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
 from fastapi.security import HTTPBearer
-from passlib.context import CryptContext
+
+from src.core.metrics import PASSWORD_HASH_QUEUE, PASSWORD_HASH_REJECTED
+from src.core.settings import settings
 
 
 class PasswordManager(ABC):
@@ -50,10 +56,21 @@ class BcryptPasswordManager(PasswordManager):
         """
         初始化Bcrypt密码管理器。
 
-        创建一个CryptContext实例，配置使用bcrypt方案。
+        CryptContext 在第一次哈希/校验时才创建，passlib 和 bcrypt 不在启动时导入。
+        """
+        self._pwd_context = None
+
+    @property
+    def pwd_context(self):
+        """
+        配置使用bcrypt方案的CryptContext实例。
         'deprecated="auto"' 允许自动处理已弃用的哈希方法。
         """
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        if self._pwd_context is None:
+            from passlib.context import CryptContext
+
+            self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        return self._pwd_context
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
@@ -82,6 +99,116 @@ class BcryptPasswordManager(PasswordManager):
         """
         return self.pwd_context.hash(password)
 
+    def __reduce__(self):
+        """进程池中传递实例时只需重新构建，无需序列化CryptContext。"""
+        return self.__class__, ()
+
+
+class PasswordHashBusyError(Exception):
+    """密码哈希等待队列已满时抛出，调用方应快速返回繁忙响应。"""
+
+
+class AsyncPasswordManager:
+    """
+    异步密码管理器。
+
+    将同步的密码哈希/校验放到线程池或进程池中执行，避免阻塞事件循环。
+    同时执行的哈希数量受 max_workers 限制，排队数量超过 max_queue 时立即抛出 PasswordHashBusyError。
+    """
+
+    def __init__(
+            self,
+            password_manager: PasswordManager,
+            max_workers: int = settings.password_hash.workers,
+            max_queue: int = settings.password_hash.max_queue,
+            use_processes: bool = settings.password_hash.use_processes,
+    ):
+        """
+        初始化异步密码管理器。
+
+        Args:
+            password_manager (PasswordManager): 实际执行哈希的同步密码管理器。
+            max_workers (int): 同时执行哈希的最大数量，即线程/进程池大小。
+            max_queue (int): 允许排队等待的最大请求数。
+            use_processes (bool): 为True时使用进程池，否则使用线程池。
+        """
+        self.password_manager = password_manager
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._waiting = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, func, *args):
+        """
+        在池中执行哈希函数，超出排队上限时直接拒绝。
+
+        Raises:
+            PasswordHashBusyError: 等待中的请求数达到 max_queue 时抛出。
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            PASSWORD_HASH_REJECTED.inc()
+            raise PasswordHashBusyError("密码服务繁忙")
+
+        self._waiting += 1
+        start = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        PASSWORD_HASH_QUEUE.observe(time.perf_counter() - start)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self._semaphore.release()
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        异步验证明文密码是否与哈希密码匹配。
+
+        Args:
+            plain_password (str): 用户输入的明文密码。
+            hashed_password (str): 存储在数据库中的哈希密码。
+
+        Returns:
+            bool: 如果密码匹配返回True，否则返回False。
+        """
+        return await self._run(self.password_manager.verify_password, plain_password, hashed_password)
+
+    async def hash_password(self, password: str) -> str:
+        """
+        异步将明文密码转换为哈希密码。
+
+        Args:
+            password (str): 需要哈希化的明文密码。
+
+        Returns:
+            str: 哈希后的密码。
+        """
+        return await self._run(self.password_manager.hash_password, password)
+
+    def shutdown(self):
+        """关闭线程/进程池。"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
 
 # 创建一个HTTPBearer实例，用于处理Bearer令牌认证
 bearer = HTTPBearer()
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+模型序列化
+
+为每个 Tortoise 模型构建一次不含关联字段的序列化器，替代每次调用 pydantic_model_creator 生成模型的
+from_tortoise_orm（异步、逐字段遍历并处理关联）：
+
+    serializer = get_serializer(User)
+    serializer.dump(user)           # dict
+    serializer.dump_many(users)     # list[dict]
+    serializer.construct(user)      # pydantic 模型实例，不做校验
+    serializer.dump_json(users)     # 由 TypeAdapter 直接生成 JSON bytes
+
+应用启动时 build_serializers() 为所有已注册模型预先构建序列化器。
+"""
+from operator import attrgetter
+from typing import Any, Optional
+
+from pydantic import TypeAdapter, create_model
+from tortoise import Tortoise
+# pydantic 在 Python 3.12 以下要求使用 typing_extensions 的 TypedDict
+from typing_extensions import TypedDict
+
+
+class ModelSerializer:
+    """
+    单个模型的序列化器。
+
+    字段列表只包含数据库列（外键为 xxx_id），不访问关联对象，不会触发额外查询。
+    pydantic 模型与 TypeAdapter 在第一次使用时构建。
+    """
+
+    def __init__(self, model, exclude: tuple = (), pydantic_model=None):
+        """
+        Args:
+            model: Tortoise 模型类。
+            exclude (tuple): 不输出的字段，如 password。
+            pydantic_model: construct 使用的 pydantic 模型或返回模型的函数，默认按字段类型生成。
+        """
+        self.model = model
+        self.exclude = tuple(exclude)
+        self._pydantic_model = pydantic_model
+        self.build()
+
+    def build(self):
+        """按模型当前的字段重新生成字段列表，TypeAdapter 在下次使用时重新构建。"""
+        self.fields = tuple(
+            name for name in self.model._meta.fields_db_projection if name not in self.exclude
+        )
+        self._getter = attrgetter(*self.fields)
+        self._adapter: TypeAdapter | None = None
+
+    def _field_types(self) -> dict:
+        fields_map = self.model._meta.fields_map
+        types = {}
+        for name in self.fields:
+            field = fields_map[name]
+            field_type = getattr(field, "field_type", None) or Any
+            types[name] = Optional[field_type] if field.null else field_type
+        return types
+
+    @property
+    def pydantic_model(self):
+        if self._pydantic_model is None:
+            self._pydantic_model = create_model(
+                f"{self.model.__name__}Out",
+                **{name: (field_type, None) for name, field_type in self._field_types().items()},
+            )
+        elif not isinstance(self._pydantic_model, type):
+            self._pydantic_model = self._pydantic_model()
+        return self._pydantic_model
+
+    @property
+    def adapter(self) -> TypeAdapter:
+        """list[TypedDict] 的 TypeAdapter，直接序列化 dump_many 的结果。"""
+        if self._adapter is None:
+            row_type = TypedDict(f"{self.model.__name__}Row", self._field_types())
+            self._adapter = TypeAdapter(list[row_type])
+        return self._adapter
+
+    def dump(self, obj) -> dict:
+        """模型实例转换为字典。"""
+        values = self._getter(obj)
+        if len(self.fields) == 1:
+            values = (values,)
+        return dict(zip(self.fields, values))
+
+    def dump_many(self, objs) -> list:
+        """模型实例列表转换为字典列表。"""
+        return [self.dump(obj) for obj in objs]
+
+    def construct(self, obj):
+        """转换为 pydantic 模型实例，数据来自数据库，跳过校验。"""
+        return self.pydantic_model.model_construct(**self.dump(obj))
+
+    def dump_json(self, objs) -> bytes:
+        """模型实例列表直接序列化为 JSON bytes。"""
+        return self.adapter.dump_json(self.dump_many(objs))
+
+
+# {模型类: 序列化器}
+_serializers: dict = {}
+
+
+def register_serializer(model, exclude: tuple = (), pydantic_model=None) -> ModelSerializer:
+    """
+    注册模型的序列化器，用于指定排除字段或 pydantic 模型，未注册的模型使用默认序列化器。
+
+    Args:
+        model: Tortoise 模型类。
+        exclude (tuple): 不输出的字段。
+        pydantic_model: pydantic 模型或返回模型的函数（延迟构建）。
+    """
+    serializer = ModelSerializer(model, exclude=exclude, pydantic_model=pydantic_model)
+    _serializers[model] = serializer
+    return serializer
+
+
+def get_serializer(model) -> ModelSerializer:
+    """返回模型的序列化器，不存在时构建并缓存。"""
+    serializer = _serializers.get(model)
+    if serializer is None:
+        serializer = _serializers[model] = ModelSerializer(model)
+    return serializer
+
+
+def build_serializers():
+    """
+    为所有已注册的 Tortoise 模型构建序列化器。
+
+    需要在 Tortoise 初始化之后调用，此时外键的 xxx_id 字段已经生成。
+    已注册的序列化器原地重新构建，模块中持有的引用保持有效。
+    """
+    for app in Tortoise.apps.values():
+        for model in app.values():
+            serializer = _serializers.get(model)
+            if serializer is None:
+                _serializers[model] = ModelSerializer(model)
+            else:
+                serializer.build()
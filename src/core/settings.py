@@ -0,0 +1,210 @@
+"""
+应用配置
+
+优先级从低到高：字段默认值 < 环境默认值(APP_ENV) < 配置文件(APP_SETTINGS_FILE, json/toml) < 环境变量。
+环境变量使用 APP_ 前缀，嵌套字段用双下划线分隔，例如：
+
+    APP_ENV=prod
+    APP_DB__HOST=10.0.0.1
+    APP_DB__MAXSIZE=20
+    APP_CACHE__USER_TTL=120
+"""
+import json
+import os
+import tomllib
+
+from pydantic import BaseModel, Field, field_validator
+
+ENV_PREFIX = "APP_"
+
+
+class DatabaseSettings(BaseModel):
+    """数据库连接与连接池配置"""
+
+    host: str = "localhost"
+    port: int = 3306
+    user: str = "root"
+    password: str = "123456"
+    database: str = "web-test"
+    charset: str = "utf8mb4"
+    minsize: int = Field(1, description="连接池最小连接数", ge=0)
+    maxsize: int = Field(5, description="连接池最大连接数", ge=1)
+    connect_timeout: float = Field(10, description="建立连接超时时间（秒）")
+    pool_recycle: int = Field(-1, description="连接回收时间（秒），-1 不回收，应小于MySQL wait_timeout")
+    echo: bool = Field(False, description="是否打印所有SQL，生产环境不要开")
+    replicas: list[str] = Field([], description="只读从库地址 host:port，逗号分隔，账号密码与主库相同")
+    read_strategy: str = Field("round_robin", description="从库选择策略 round_robin/least_busy")
+    read_your_writes_window: float = Field(2, description="写操作后该时间（秒）内本请求的读操作走主库")
+    replica_max_lag: float = Field(5, description="从库复制延迟超过该值（秒）时摘除")
+    replica_check_interval: float = Field(5, description="从库健康检查间隔（秒）")
+
+    @field_validator("replicas", mode="before")
+    @classmethod
+    def split_replicas(cls, value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+
+class PasswordHashSettings(BaseModel):
+    """密码哈希线程/进程池配置"""
+
+    workers: int = Field(default_factory=lambda: min(4, os.cpu_count() or 1), description="同时执行的哈希数量")
+    max_queue: int = Field(64, description="允许排队的最大请求数，超出后直接拒绝")
+    use_processes: bool = Field(False, description="使用进程池代替线程池")
+
+
+class CacheSettings(BaseModel):
+    """进程内缓存配置，size 为 0 时关闭对应缓存"""
+
+    user_size: int = 4096
+    user_ttl: float = 60
+    jwt_size: int = 10000
+    jwt_ttl: float = 300
+    count_size: int = 1024
+    count_ttl: float = 30
+    count_estimate_min_rows: int = Field(100000, description="估算总数低于该值时仍然精确计数")
+
+
+class LogSettings(BaseModel):
+    """日志配置"""
+
+    dir: str = Field("logs", description="日志目录")
+    queue_size: int = Field(10000, description="日志队列容量")
+    queue_policy: str = Field("drop", description="队列满时的策略 drop 丢弃/block 阻塞等待")
+    block_timeout: float = Field(0.1, description="block 策略下最长等待时间（秒），超时后丢弃")
+    batch_size: int = Field(100, description="后台线程每批写入的最大记录数")
+    json_lines: bool = Field(False, description="输出结构化JSON行")
+    api_sample_rate: float = Field(0.01, description="接口调用详细日志的采样比例", ge=0, le=1)
+    api_slow_ms: float = Field(500, description="超过该耗时（毫秒）的调用总是记录日志")
+
+
+class ProfilerSettings(BaseModel):
+    """请求级SQL分析配置，关闭时没有任何额外开销"""
+
+    enabled: bool = Field(False, description="是否启用SQL分析，启用后请求头带 X-DB-Profile: 1 的请求会被记录")
+    always: bool = Field(False, description="记录所有请求，不需要请求头")
+    header: str = Field("X-DB-Profile", description="开启分析的请求头，同时也是返回摘要的响应头")
+    n_plus_one_threshold: int = Field(5, description="同一结构的SQL在一个请求内执行达到该次数时标记为N+1", ge=2)
+    history: int = Field(100, description="保留最近的分析结果数")
+
+
+class RateLimitSettings(BaseModel):
+    """登录限流配置，按滑动窗口计数"""
+
+    enabled: bool = Field(True, description="是否启用限流")
+    paths: list[str] = Field(["/user/login", "/user/token"], description="按IP限流的路径，逗号分隔")
+    ip_limit: int = Field(20, description="单个IP在窗口内对上述路径的最大请求数", ge=1)
+    ip_window: float = Field(60, description="IP限流窗口（秒）", gt=0)
+    username_limit: int = Field(5, description="单个用户名在窗口内允许的最大登录失败次数", ge=1)
+    username_window: float = Field(300, description="用户名限流窗口（秒）", gt=0)
+    max_keys: int = Field(100000, description="内存存储最多保存的计数器数量，超出后淘汰最久未使用的", ge=1)
+    trust_forwarded: bool = Field(False, description="部署在反向代理后时使用 X-Forwarded-For 中的客户端IP")
+    forwarded_hops: int = Field(1, description="可信反向代理的层数，取 X-Forwarded-For 从右数第该个地址", ge=1)
+
+    @field_validator("paths", mode="before")
+    @classmethod
+    def split_paths(cls, value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+
+class ServerSettings(BaseModel):
+    """生产环境启动配置，见 src/serve.py"""
+
+    bind: str = Field("0.0.0.0:8000", description="监听地址 host:port")
+    workers: int = Field(0, description="worker 进程数，0 按CPU核数自动计算", ge=0)
+    preload: bool = Field(True, description="主进程预先导入应用，fork 后 worker 共享只读内存")
+    timeout: int = Field(60, description="worker 无响应超过该时间（秒）后重启")
+    graceful_timeout: int = Field(30, description="收到 SIGTERM 后等待处理中请求完成的最长时间（秒）")
+    keepalive: int = Field(5, description="HTTP keep-alive 时间（秒）")
+    max_requests: int = Field(10000, description="worker 处理该数量的请求后重启，缓解内存泄漏，0 不重启", ge=0)
+    max_requests_jitter: int = Field(1000, description="max_requests 的随机抖动，避免所有 worker 同时重启", ge=0)
+
+
+class Settings(BaseModel):
+    env: str = Field("dev", description="运行环境 dev/test/prod")
+    db: DatabaseSettings = DatabaseSettings()
+    password_hash: PasswordHashSettings = PasswordHashSettings()
+    cache: CacheSettings = CacheSettings()
+    log: LogSettings = LogSettings()
+    profiler: ProfilerSettings = ProfilerSettings()
+    server: ServerSettings = ServerSettings()
+    rate_limit: RateLimitSettings = RateLimitSettings()
+    admin_usernames: list[str] = Field([], description="允许调用管理接口（如 /user/export）的用户名，逗号分隔")
+    insert_batch_size: int = Field(1000, description="DbHelper.inserts 默认每批行数")
+    routes_manifest: str = Field("", description="路由清单路径，存在时按清单注册路由，不扫描目录")
+    metrics_refresh_interval: float = Field(5, description="多进程部署时每个 worker 刷新连接池/缓存指标的间隔（秒）", gt=0)
+
+    @field_validator("admin_usernames", mode="before")
+    @classmethod
+    def split_admin_usernames(cls, value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+
+# 各环境的默认值
+ENV_DEFAULTS = {
+    "dev": {"db": {"echo": True}},
+    "test": {"db": {"echo": False}},
+    "prod": {"db": {"echo": False, "minsize": 5, "maxsize": 20, "pool_recycle": 3600}},
+}
+
+
+def _merge(base: dict, override: dict) -> dict:
+    """递归合并字典，override 优先。"""
+    result = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = _merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def _read_file(path: str) -> dict:
+    with open(path, "rb") as f:
+        if path.endswith(".toml"):
+            return tomllib.load(f)
+        return json.load(f)
+
+
+def _read_env(environ) -> dict:
+    """将 APP_DB__MAXSIZE=20 转换为 {"db": {"maxsize": "20"}}。"""
+    values = {}
+    for key, value in environ.items():
+        if not key.startswith(ENV_PREFIX) or key == f"{ENV_PREFIX}SETTINGS_FILE":
+            continue
+        *parents, name = key[len(ENV_PREFIX):].lower().split("__")
+        node = values
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[name] = value
+    return values
+
+
+def load_settings(environ=None) -> Settings:
+    """
+    按优先级加载配置。
+
+    Args:
+        environ: 环境变量映射，默认 os.environ。
+
+    Returns:
+        Settings: 校验后的配置对象。
+    """
+    environ = os.environ if environ is None else environ
+    env_values = _read_env(environ)
+    file_path = environ.get(f"{ENV_PREFIX}SETTINGS_FILE")
+    file_values = _read_file(file_path) if file_path else {}
+    env = env_values.get("env") or file_values.get("env") or "dev"
+
+    values = _merge(ENV_DEFAULTS.get(env, {}), file_values)
+    values = _merge(values, env_values)
+    values["env"] = env
+    return Settings.model_validate(values)
+
+
+settings = load_settings()
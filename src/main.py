@@ -1,11 +1,54 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from tortoise.contrib.fastapi import register_tortoise
+from tortoise.contrib.fastapi import RegisterTortoise
 
 from src.core.auth_middleware import add_auth_middleware
+from src.core.container import container
 from src.core.custom_response import CustomJSONResponse
 from src.core.dbConfig import TORTOISE_ORM
+from src.core.db_profiler import DbProfilerMiddleware
+from src.core.db_router import replica_set
 from src.core.load_routers import register_routes
+from src.core.log_config import setup_logging, shutdown_logging
+from src.core.metrics import MetricsMiddleware, start_gauge_refresh, stop_gauge_refresh
+from src.core.rate_limit import RateLimitMiddleware
+from src.core.serializers import build_serializers
+from src.core.settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期。
+
+    日志文件、数据库连接等有副作用的初始化都放在这里而不是导入时，gunicorn --preload 时
+    主进程只导入代码，每个 worker 启动后各自建立连接池和日志线程。
+    """
+    setup_logging()
+    # 注册数据库
+    async with RegisterTortoise(
+            app=app,
+            config=TORTOISE_ORM,
+            # generate_schemas=True,  # 如果数据库为空，则自动生成对应表单，生产环境不要开
+            # add_exception_handlers=True,  # 生产环境不要开，会泄露调试信息
+    ):
+        # 模型注册完成后构建序列化器
+        build_serializers()
+        # 数据库初始化后启动从库健康检查
+        await replica_set.start()
+        # 多进程时每个 worker 定时刷新自己的连接池/缓存指标
+        start_gauge_refresh()
+        try:
+            yield
+        finally:
+            stop_gauge_refresh()
+            await replica_set.stop()
+            # 关闭时释放密码哈希线程/进程池
+            container.shutdown()
+    shutdown_logging()
+
 
 app = FastAPI(
     title="fastapi-template",
@@ -15,15 +58,8 @@ app = FastAPI(
     # Swagger UI 配置
     docs_url="/docs",  # Swagger UI的访问地址
     redoc_url="/redoc",  # ReDoc文档的访问地址
-    openapi_url="/openapi.json"  # OpenAPI架构的地址
-)
-
-# 注册数据库
-register_tortoise(
-    app=app,
-    config=TORTOISE_ORM,
-    # generate_schemas=True,  # 如果数据库为空，则自动生成对应表单，生产环境不要开
-    # add_exception_handlers=True,  # 生产环境不要开，会泄露调试信息
+    openapi_url="/openapi.json",  # OpenAPI架构的地址
+    lifespan=lifespan,
 )
 
 # 定义允许的来源、方法和头
@@ -44,5 +80,16 @@ app.add_middleware(
 # 添加认证中间件
 add_auth_middleware(app)
 
+# SQL分析中间件放在认证外层，认证时查询用户的SQL也会被记录
+if settings.profiler.enabled:
+    app.add_middleware(DbProfilerMiddleware)
+
+# 登录接口按IP限流，放在认证之外，超限请求不会进入后续处理
+if settings.rate_limit.enabled:
+    app.add_middleware(RateLimitMiddleware, limiter=container.ip_rate_limiter)
+
+# 请求指标中间件放在最外层，统计包含认证在内的完整耗时
+app.add_middleware(MetricsMiddleware)
+
 # 自动注册路由
 register_routes(app)
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, status
+from starlette.responses import Response
+
+from src.core.auth_middleware import public
+from src.core.db_profiler import get_profile, recent_profiles
+from src.core.interfaces.response import response
+from src.core.load_routers import controller
+from src.core.log import api_stats_snapshot
+from src.core.metrics import render_metrics
+
+
+@controller
+class MonitorController:
+    def __init__(self):
+        self.router = APIRouter(tags=["监控"])
+
+        @self.router.get("/metrics", summary="Prometheus 指标", include_in_schema=False)
+        @public
+        async def get_metrics():
+            content, content_type = render_metrics()
+            return Response(content=content, media_type=content_type)
+
+        @self.router.get("/internal/api-stats", summary="接口调用统计")
+        async def get_api_stats():
+            return response(data=api_stats_snapshot())
+
+        @self.router.get("/internal/db-pool", summary="数据库连接池统计")
+        async def get_db_pool_stats():
+            # db_backend 依赖 aiomysql/pymysql，在这里导入以免启动时加载 MySQL 驱动及其加密库
+            from src.core.db_backend import pool_stats
+
+            return response(data=pool_stats())
+
+        @self.router.get("/internal/db-profile", summary="最近的SQL分析结果")
+        async def get_db_profiles():
+            return response(data=[profile.summary() for profile in reversed(recent_profiles)])
+
+        @self.router.get("/internal/db-profile/{profile_id}", summary="单个请求的SQL明细")
+        async def get_db_profile(profile_id: str):
+            profile = get_profile(profile_id)
+            if profile is None:
+                return response(code=status.HTTP_404_NOT_FOUND, message="分析记录不存在")
+            return response(data=profile)
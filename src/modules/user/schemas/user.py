@@ -1,5 +1,6 @@
+from functools import cache
+
 from pydantic import BaseModel
-from tortoise.contrib.pydantic import pydantic_model_creator
 from fastapi import Form
 
 from src.modules.user.models import User
@@ -31,4 +32,13 @@ class UserLogin(BaseModel):
         return cls(username=username, password=password)
 
 
-UserInDB = pydantic_model_creator(User, name="UserInDB", exclude=("password",))
+@cache
+def get_user_in_db():
+    """
+    不含密码的用户模型 UserInDB。
+
+    首次使用时才由 pydantic_model_creator 生成，避免导入时构建模型。
+    """
+    from tortoise.contrib.pydantic import pydantic_model_creator
+
+    return pydantic_model_creator(User, name="UserInDB", exclude=("password",))
@@ -1,39 +1,53 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from starlette.responses import Response
 
-from src.core.auth import get_current_user, get_refresh_token
+from src.core.auth import get_refresh_token, get_request_user, require_admin
+from src.core.auth_middleware import public
+from src.core.export import EXPORT_CSV, EXPORT_NDJSON
 from src.core.interfaces.response import response, token_response
+from src.core.load_routers import controller
 from src.core.log import log_api_call
 from src.modules.user.schemas.user import UserCreate, UserLogin
-from src.modules.user.user_service import UserService
+from src.modules.user.user_service import UserExportService, UserService
 
 
+@controller
 class UserController:
     def __init__(self):
         self.router = APIRouter(prefix="/user", tags=["用户模块"])
 
         @self.router.post("/register", summary="注册")
+        @public
         async def register_user(user: UserCreate, user_service: UserService = Depends(UserService)):
             return await user_service.create_user(user)
 
         @self.router.post("/login", summary="登录")
+        @public
         # @log_api_call
         async def login_user(
                 user: UserLogin = Depends(UserLogin.as_form),
                 user_service: UserService = Depends(UserService)
         ):
             data = await user_service.authenticate_user(user)
+            # 认证失败/限流时直接返回服务层的错误响应
+            if isinstance(data, Response):
+                return data
             return response(data=data, message="登录成功！")
 
         @self.router.post("/token", summary="获取token")
+        @public
         # @log_api_call
         async def get_token(
                 user: UserLogin = Depends(UserLogin.as_form),
                 user_service: UserService = Depends(UserService)
         ):
             data = await user_service.authenticate_user(user)
+            if isinstance(data, Response):
+                return data
             return token_response(access_token=data['access_token'], token_type=data['token_type'])
 
         @self.router.post("/refresh", summary="刷新访问令牌")
+        @public
         async def refresh_token_route(
                 refresh_token: str = Depends(get_refresh_token),
                 user_service: UserService = Depends(UserService)
@@ -42,9 +56,17 @@ class UserController:
 
         @self.router.get("/userInfo", summary="获取当前用户信息")
         @log_api_call
-        async def get_current_user_info(current_user=Depends(get_current_user)):
+        async def get_current_user_info(current_user=Depends(get_request_user)):
             return response(data=current_user)
 
+        @self.router.get("/export", summary="导出用户", dependencies=[Depends(require_admin)])
+        async def export_users(
+                fmt: str = Query(EXPORT_NDJSON, pattern=f"^({EXPORT_NDJSON}|{EXPORT_CSV})$", description="导出格式"),
+                export_service: UserExportService = Depends(UserExportService)
+        ):
+            # 按主键分批读取并流式输出，内存占用与用户数量无关
+            return export_service.export_items(fmt)
+
         @self.router.get("/test", summary="测试")
         async def get_current_user2():
             return response(code=404, message="你可以啊")
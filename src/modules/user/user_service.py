@@ -1,12 +1,17 @@
 from fastapi import Depends, status
 from tortoise.exceptions import IntegrityError
 
-from src.core.security import PasswordManager, BcryptPasswordManager
-from src.core.jwt import TokenManager, JWTTokenManager
+from src.common.service import Service
+from src.core.auth import invalidate_user, user_serializer
+from src.core.container import container
+from src.core.security import AsyncPasswordManager, PasswordHashBusyError
+from src.core.dbhelper import DbHelper
+from src.core.jwt import TokenManager
 from src.core.log_config import api_logger, error_logger
+from src.core.rate_limit import RateLimiter, too_many_requests, username_key
 from src.core.interfaces.response import response
 from src.modules.user.models import User
-from src.modules.user.schemas.user import UserCreate, UserLogin, UserInDB
+from src.modules.user.schemas.user import UserCreate, UserLogin
 
 
 class UserService:
@@ -19,18 +24,21 @@ class UserService:
 
     def __init__(
             self,
-            password_manager: PasswordManager = Depends(BcryptPasswordManager),
-            token_manager: TokenManager = Depends(JWTTokenManager)
+            password_manager: AsyncPasswordManager = Depends(container.async_password_manager.dependency),
+            token_manager: TokenManager = Depends(container.token_manager.dependency),
+            login_rate_limiter: RateLimiter | None = Depends(container.login_rate_limiter.dependency)
     ):
         """
         初始化UserService实例。
 
         Args:
-            password_manager (PasswordManager): 用于处理密码加密和验证的管理器。
+            password_manager (AsyncPasswordManager): 在线程/进程池中处理密码加密和验证的管理器。
             token_manager (TokenManager): 用于处理JWT令牌的创建和验证的管理器。
+            login_rate_limiter (RateLimiter): 按用户名限制登录尝试次数的限流器，登录成功后清零，为None时不限流。
         """
         self.password_manager = password_manager
         self.token_manager = token_manager
+        self.login_rate_limiter = login_rate_limiter
 
     async def create_user(self, user: UserCreate):
         """
@@ -45,12 +53,16 @@ class UserService:
         Raises:
             IntegrityError: 当尝试创建已存在的用户名时抛出。
         """
-        hashed_password = self.password_manager.hash_password(user.password)
+        try:
+            hashed_password = await self.password_manager.hash_password(user.password)
+        except PasswordHashBusyError:
+            return response(code=status.HTTP_503_SERVICE_UNAVAILABLE, message="服务繁忙，请稍后重试")
         try:
             new_user = await User.create(
                 username=user.username,
                 password=hashed_password,
             )
+            invalidate_user(new_user.username)
             return response(message="用户创建成功", data={"id": new_user.id, "username": new_user.username})
         except IntegrityError as e:
             if "username" in str(e):
@@ -67,13 +79,27 @@ class UserService:
 
         Returns:
             dict: 包含认证结果的响应。如果成功，返回访问令牌和刷新令牌；如果失败，返回错误信息。
+                登录失败次数超限时返回429响应，此时不查询数据库也不做密码校验。
         """
+        if self.login_rate_limiter is not None:
+            # 校验前先占用一次计数，并发的请求不会同时通过检查；登录成功后清除
+            limited = await self.login_rate_limiter.hit(username_key(user.username))
+            if not limited.allowed:
+                return too_many_requests(limited)
+
         db_user = await User.get_or_none(username=user.username)
 
         if db_user is None:
             return response(code=404, message="用户名不存在！")
 
-        if self.password_manager.verify_password(user.password, db_user.password):
+        try:
+            verified = await self.password_manager.verify_password(user.password, db_user.password)
+        except PasswordHashBusyError:
+            return response(code=status.HTTP_503_SERVICE_UNAVAILABLE, message="服务繁忙，请稍后重试")
+
+        if verified:
+            if self.login_rate_limiter is not None:
+                await self.login_rate_limiter.reset(username_key(user.username))
             access_token = self.token_manager.create_access_token(data={"sub": db_user.username})
             refresh_token = self.token_manager.create_refresh_token(data={"sub": user.username})
             # 确保令牌是字符串类型
@@ -111,7 +137,7 @@ class UserService:
             user = await User.get_or_none(username=token_data.username)
             if user is None:
                 raise response(code=status.HTTP_404_NOT_FOUND, message="未找到用户")
-            return await UserInDB.from_tortoise_orm(user)
+            return user_serializer.construct(user)
         except Exception as e:
             raise response(code=status.HTTP_401_UNAUTHORIZED, message=f"无法验证凭据, {e}")
 
@@ -139,4 +165,17 @@ class UserService:
                 message="令牌刷新成功"
             )
         except ValueError:
-            return response(code=status.HTTP_401_UNAUTHORIZED, message="无效的刷新令牌")
\ No newline at end of file
+            return response(code=status.HTTP_401_UNAUTHORIZED, message="无效的刷新令牌")
+
+class UserExportService(Service):
+    """
+    用户导出服务，流式输出全部用户，不包含密码。
+
+    User 没有逻辑删除字段，不过滤 status。
+    """
+
+    filter_del = {}
+    export_fields = list(user_serializer.fields)
+
+    def __init__(self):
+        super().__init__(DbHelper(User))
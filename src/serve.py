@@ -0,0 +1,160 @@
+"""
+生产环境启动入口
+
+使用 gunicorn 管理多个 UvicornWorker 进程，worker 数默认按可用CPU核数计算，安装了 uvloop/httptools 时自动启用。
+配置来自 settings.server（APP_SERVER__* 环境变量），命令行参数优先：
+
+    poetry run serve
+    poetry run serve --bind 0.0.0.0:8005 --workers 4 --no-preload
+    poetry run serve --reload        # 开发环境，单进程 uvicorn 热重载
+
+--preload 时主进程只导入应用代码，数据库连接池、日志线程等在每个 worker 的 lifespan 中创建，不会跨 fork 共享。
+收到 SIGTERM 后 gunicorn 停止接收新连接，等待处理中的请求完成（最长 graceful_timeout 秒）再退出。
+没有 gunicorn 的环境（如 Windows）回退到 uvicorn 自带的多进程模式。
+"""
+import argparse
+import importlib.util
+import os
+import random
+import tempfile
+
+from src.core.settings import settings
+
+APP = "src.main:app"
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+# 安装了 uvloop/httptools 时使用，否则回退到标准库 asyncio 和 h11
+LOOP = "uvloop" if _available("uvloop") else "asyncio"
+HTTP = "httptools" if _available("httptools") else "h11"
+
+try:
+    from gunicorn.app.base import BaseApplication
+
+    try:
+        from uvicorn_worker import UvicornWorker
+    except ImportError:
+        from uvicorn.workers import UvicornWorker
+except ImportError:  # pragma: no cover - gunicorn 不支持 Windows
+    BaseApplication = UvicornWorker = None
+
+
+def default_workers() -> int:
+    """按当前进程可用的CPU核数计算 worker 数，容器中限制了CPU亲和性时以限制为准。"""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    return max(cpus, 1)
+
+
+def child_exit(server, worker):
+    """worker 退出时清理其 Prometheus 多进程指标。"""
+    from src.core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
+
+
+if BaseApplication is not None:
+    class Worker(UvicornWorker):
+        """显式指定事件循环和 HTTP 解析器的 UvicornWorker，并强制启用 lifespan。"""
+
+        CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "loop": LOOP, "http": HTTP, "lifespan": "on"}
+
+
+    class GunicornApplication(BaseApplication):
+        """以代码方式配置的 gunicorn 应用，不需要额外的配置文件。"""
+
+        def __init__(self, app_uri: str, options: dict):
+            self.app_uri = app_uri
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            module_name, app_name = self.app_uri.split(":")
+            module = importlib.import_module(module_name)
+            return getattr(module, app_name)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    server = settings.server
+    parser = argparse.ArgumentParser(description="启动 fastapi-template")
+    parser.add_argument("--bind", default=server.bind, help="监听地址 host:port")
+    parser.add_argument("--workers", type=int, default=server.workers or default_workers(), help="worker 进程数")
+    parser.add_argument("--preload", action=argparse.BooleanOptionalAction, default=server.preload,
+                        help="主进程预先导入应用")
+    parser.add_argument("--timeout", type=int, default=server.timeout)
+    parser.add_argument("--graceful-timeout", type=int, default=server.graceful_timeout)
+    parser.add_argument("--keepalive", type=int, default=server.keepalive)
+    parser.add_argument("--max-requests", type=int, default=server.max_requests)
+    parser.add_argument("--max-requests-jitter", type=int, default=server.max_requests_jitter)
+    parser.add_argument("--reload", action="store_true", help="开发模式，单进程 uvicorn 热重载")
+    return parser.parse_args(argv)
+
+
+def _prepare_metrics_dir(workers: int):
+    """多进程时为 Prometheus 指标准备目录，必须在导入应用之前设置。"""
+    if workers > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+
+def run_gunicorn(args: argparse.Namespace):
+    options = {
+        "bind": args.bind,
+        "workers": args.workers,
+        "worker_class": "src.serve.Worker",
+        "preload_app": args.preload,
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "keepalive": args.keepalive,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests_jitter,
+        "child_exit": child_exit,
+    }
+    print(f"🚀 gunicorn {args.bind} workers={args.workers} loop={LOOP} http={HTTP} preload={args.preload}")
+    GunicornApplication(APP, options).run()
+
+
+def run_uvicorn(args: argparse.Namespace):
+    import uvicorn
+
+    host, _, port = args.bind.rpartition(":")
+    workers = 1 if args.reload else args.workers
+    # uvicorn 没有抖动参数，启动时取一次随机值
+    max_requests = args.max_requests + random.randint(0, args.max_requests_jitter) if args.max_requests else None
+    print(f"🚀 uvicorn {args.bind} workers={workers} loop={LOOP} http={HTTP} reload={args.reload}")
+    uvicorn.run(
+        APP,
+        host=host or "0.0.0.0",
+        port=int(port),
+        workers=workers,
+        reload=args.reload,
+        loop=LOOP,
+        http=HTTP,
+        lifespan="on",
+        timeout_keep_alive=args.keepalive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        limit_max_requests=None if args.reload else max_requests,
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.reload:
+        _prepare_metrics_dir(args.workers)
+    if args.reload or BaseApplication is None:
+        run_uvicorn(args)
+    else:
+        run_gunicorn(args)
+
+
+if __name__ == "__main__":
+    main()
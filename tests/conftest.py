@@ -0,0 +1,61 @@
+import httpx
+import pytest
+from tortoise import Tortoise, connections
+
+from src.core.auth import invalidate_user
+
+MODELS = ["src.modules.user.models.user", "tests.models"]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """内存SQLite数据库，每个测试独立建表。"""
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": MODELS})
+    await Tortoise.generate_schemas()
+    invalidate_user()
+    yield
+    await Tortoise.close_connections()
+
+
+class QueryCounter:
+    """记录默认连接上执行的SQL"""
+
+    def __init__(self):
+        self.queries: list = []
+
+    def count(self, table: str) -> int:
+        """涉及指定表的SQL条数。"""
+        return sum(f'"{table}"' in query or f"`{table}`" in query for query in self.queries)
+
+    def clear(self):
+        self.queries.clear()
+
+
+@pytest.fixture
+def queries(db, monkeypatch) -> QueryCounter:
+    counter = QueryCounter()
+    client = connections.get("default")
+    for name in ("execute_query", "execute_query_dict", "execute_insert", "execute_many"):
+        original = getattr(client, name)
+
+        async def wrapper(query, *args, _original=original, **kwargs):
+            counter.queries.append(query)
+            return await _original(query, *args, **kwargs)
+
+        monkeypatch.setattr(client, name, wrapper)
+    return counter
+
+
+@pytest.fixture
+async def client(db):
+    """不经过 lifespan 的应用客户端，数据库由 db 夹具初始化。"""
+    from src.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
@@ -0,0 +1,13 @@
+"""测试用模型"""
+from tortoise import fields
+
+from src.common.models import TABLE_INDEXES, Table
+
+
+class Article(Table):
+    title = fields.CharField(max_length=255)
+    body = fields.TextField(default="")
+
+    class Meta:
+        table = "articles"
+        indexes = TABLE_INDEXES
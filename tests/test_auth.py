@@ -0,0 +1,30 @@
+import pytest
+
+from src.core.container import container
+from src.modules.user.models import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_user_info_queries_user_at_most_once(client, queries):
+    await User.create(username="alice", password="x")
+    token = container.token_manager().create_access_token({"sub": "alice"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    queries.clear()
+    resp = await client.get("/user/userInfo", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["data"]["username"] == "alice"
+    # 中间件解析出的用户由 get_request_user 复用，整个请求最多查询一次用户表
+    assert queries.count("users") <= 1
+
+    queries.clear()
+    resp = await client.get("/user/userInfo", headers=headers)
+    assert resp.status_code == 200
+    # 用户缓存命中，不再查询
+    assert queries.count("users") == 0
+
+
+async def test_user_info_requires_token(client):
+    resp = await client.get("/user/userInfo")
+    assert resp.json()["message"] == "认证要求, 无token！"
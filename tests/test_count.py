@@ -0,0 +1,47 @@
+import pytest
+
+from src.core.dbhelper import COUNT_ESTIMATED, SOFT_DELETE_FILTER, DbHelper
+from src.core.metrics import DB_QUERIES
+from tests.models import Article
+
+pytestmark = pytest.mark.anyio
+
+ESTIMATE = 5_000_000
+
+
+@pytest.fixture
+async def dao(db, monkeypatch) -> DbHelper:
+    for i in range(3):
+        await Article.create(title=f"高性能 {i}", status=9 if i == 0 else 1)
+
+    async def estimated_count(self):
+        return ESTIMATE
+
+    monkeypatch.setattr(DbHelper, "_estimated_count", estimated_count)
+    return DbHelper(Article)
+
+
+async def test_estimate_only_without_filters(dao):
+    assert await dao.count({}, COUNT_ESTIMATED) == ESTIMATE
+    assert await dao.count(dict(SOFT_DELETE_FILTER), COUNT_ESTIMATED) == ESTIMATE
+
+
+async def test_filtered_count_is_exact_in_estimated_mode(dao):
+    filters = {"title__contains": "2", **SOFT_DELETE_FILTER}
+    assert await dao.count(filters, COUNT_ESTIMATED) == 1
+    assert await dao.count({"status": 9}, COUNT_ESTIMATED) == 1
+    result = await dao.selects(0, 10, filters, count_mode=COUNT_ESTIMATED)
+    assert result["total"] == 1
+
+
+def samples(operation: str) -> float:
+    return DB_QUERIES.labels("Article", operation, "ok")._value.get()
+
+
+async def test_selects_is_recorded_once(dao):
+    before = {operation: samples(operation) for operation in ("selects", "count", "estimated_count")}
+    await dao.selects(0, 10, dict(SOFT_DELETE_FILTER), count_mode=COUNT_ESTIMATED)
+    assert samples("selects") == before["selects"] + 1
+    # 内部的总数查询不再单独计为一次 count
+    assert samples("count") == before["count"]
+    assert samples("estimated_count") == before["estimated_count"]
@@ -0,0 +1,41 @@
+import pytest
+from tortoise.transactions import in_transaction
+
+from src.core import db_router
+from src.core.db_router import ReplicaRouter
+from src.core.dbhelper import DbHelper
+from tests.models import Article
+
+pytestmark = pytest.mark.anyio
+
+REPLICA = "replica_0"
+
+
+@pytest.fixture
+def router(db, monkeypatch) -> ReplicaRouter:
+    monkeypatch.setattr(db_router.replica_set, "choose", lambda: REPLICA)
+    db_router._last_write_at.set(float("-inf"))
+    return ReplicaRouter()
+
+
+async def test_reads_go_to_replica_without_writes(router):
+    assert router.db_for_read(Article) == REPLICA
+
+
+async def test_inserts_open_read_your_writes_window(router):
+    await DbHelper(Article).inserts([dict(title="a"), dict(title="b")])
+    assert router.db_for_read(Article) is None
+
+
+async def test_raw_sql_write_opens_read_your_writes_window(router):
+    await DbHelper.raw_sql("SELECT 1")
+    assert router.db_for_read(Article) == REPLICA
+
+    await DbHelper.raw_sql("UPDATE articles SET title = ? WHERE id = ?", ["a", 1])
+    assert router.db_for_read(Article) is None
+
+
+async def test_reads_stay_on_transaction_connection(router):
+    async with in_transaction():
+        assert router.db_for_read(Article) is None
+    assert router.db_for_read(Article) == REPLICA
@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+
+import pytest
+from tortoise import connections
+
+from src.common.service import Service
+from src.core.container import container
+from src.core.dbhelper import DbHelper
+from src.core.settings import settings
+from src.modules.user.models import User
+from tests.models import Article
+
+pytestmark = pytest.mark.anyio
+
+# 导出内存测试的行数，本地快速验证时可以调小
+EXPORT_ROWS = int(os.environ.get("EXPORT_TEST_ROWS", 1_000_000))
+# 导出过程中进程峰值内存(RSS)允许的增长
+EXPORT_RSS_GROWTH = 64 * 1024 * 1024
+
+
+def peak_rss() -> int:
+    """进程的峰值常驻内存（字节）"""
+    resource = pytest.importorskip("resource")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def fill_articles(rows: int, chunk_size: int = 50_000):
+    """绕过 ORM 直接批量写入，缩短准备数据的时间"""
+    db = connections.get("default")
+    sql = 'INSERT INTO "articles" ("status", "title", "body") VALUES (1, ?, ?)'
+    for start in range(0, rows, chunk_size):
+        await db.execute_many(sql, [
+            [f"标题 {i}", "正文内容" * 8] for i in range(start, min(start + chunk_size, rows))
+        ])
+
+
+async def test_export_streams_large_table_in_bounded_memory(db):
+    await fill_articles(EXPORT_ROWS)
+    export = Service(DbHelper(Article)).export_items(batch_size=5000)
+
+    lines = size = 0
+    baseline = peak_rss()
+    async for chunk in export.body_iterator:
+        lines += chunk.count(b"\n")
+        size += len(chunk)
+    growth = peak_rss() - baseline
+
+    assert lines == EXPORT_ROWS
+    # 峰值只与批大小有关，不随导出总量增长
+    assert growth < EXPORT_RSS_GROWTH, f"峰值内存增长 {growth / 2 ** 20:.1f} MB，导出 {size / 2 ** 20:.1f} MB"
+
+
+async def test_export_route_requires_admin(client, monkeypatch):
+    monkeypatch.setattr(settings, "admin_usernames", ["admin"])
+    await User.create(username="user0", password="secret")
+    token = container.token_manager().create_access_token({"sub": "user0"})
+
+    resp = await client.get("/user/export", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 403
+
+
+async def test_export_route_streams_users_without_password(client, monkeypatch):
+    monkeypatch.setattr(settings, "admin_usernames", ["user0"])
+    for i in range(3):
+        await User.create(username=f"user{i}", password="secret")
+    token = container.token_manager().create_access_token({"sub": "user0"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = await client.get("/user/export", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-disposition"] == 'attachment; filename="users.ndjson"'
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["username"] for row in rows] == ["user0", "user1", "user2"]
+    assert all("password" not in row for row in rows)
+
+    resp = await client.get("/user/export", params={"fmt": "csv"}, headers=headers)
+    assert resp.text.lstrip("﻿").splitlines() == ["id,username", "1,user0", "2,user1", "3,user2"]
+
+    resp = await client.get("/user/export", params={"fmt": "xml"}, headers=headers)
+    assert resp.status_code == 422
@@ -0,0 +1,24 @@
+import pytest
+
+from src.core.log import api_stats, log_api_call
+
+pytestmark = pytest.mark.anyio
+
+
+def make_handler():
+    async def handler():
+        return 1
+
+    return handler
+
+
+async def test_stats_are_keyed_by_module_and_qualname():
+    first = make_handler()
+    second = make_handler()
+    second.__module__ = "other.module"
+
+    await log_api_call(first)()
+    await log_api_call(second)()
+
+    assert api_stats[f"{__name__}.make_handler.<locals>.handler"].calls == 1
+    assert api_stats["other.module.make_handler.<locals>.handler"].calls == 1
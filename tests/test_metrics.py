@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from src.core import metrics
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_gauges_refresh_periodically_in_each_worker(monkeypatch):
+    calls = []
+    monkeypatch.setattr(metrics, "MULTIPROCESS", True)
+    monkeypatch.setattr(metrics, "_refresh_gauges", lambda: calls.append(1))
+
+    metrics.start_gauge_refresh(0.01)
+    try:
+        await asyncio.sleep(0.05)
+    finally:
+        metrics.stop_gauge_refresh()
+    # 不依赖 /metrics 抓取，worker 自己定时刷新
+    assert len(calls) >= 2
+
+
+async def test_single_process_refreshes_on_scrape_only(monkeypatch):
+    monkeypatch.setattr(metrics, "MULTIPROCESS", False)
+    metrics.start_gauge_refresh(0.01)
+    assert metrics._refresh_task is None
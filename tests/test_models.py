@@ -0,0 +1,12 @@
+import pytest
+from tortoise import Tortoise
+from tortoise.utils import get_schema_sql
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_table_models_create_cursor_index(db):
+    sql = get_schema_sql(Tortoise.get_connection("default"), safe=False)
+    # 游标分页依赖的 (created, id) 联合索引
+    assert 'ON "articles" ("created", "id")' in sql
+    assert 'ON "articles" ("status")' in sql
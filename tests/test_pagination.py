@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.common.service import Service
+from src.core.dbhelper import DbHelper
+from tests.models import Article
+
+pytestmark = pytest.mark.anyio
+
+
+async def walk(service: Service, limit: int) -> list:
+    items, cursor = [], None
+    while True:
+        result = await service.get_items_by_cursor(cursor, limit)
+        page = result["data"]
+        items.extend(page["list"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+async def test_cursor_pages_cover_rows_with_null_created(db):
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(10):
+        await Article.create(title=f"a{i}")
+    # 部分行 created 相同，部分为空
+    for i, article in enumerate(await Article.all().order_by("id")):
+        created = None if i % 3 == 0 else base + timedelta(minutes=i // 2)
+        await Article.filter(id=article.id).update(created=created)
+
+    service = Service(DbHelper(Article))
+    for limit in (1, 3, 4, 20):
+        items = await walk(service, limit)
+        assert [item["id"] for item in items].count(None) == 0
+        assert sorted(item["id"] for item in items) == list(range(1, 11))
+        assert len(items) == 10
+        # 与 get_items 输出相同的字典结构
+        assert isinstance(items[0], dict) and "title" in items[0]
+
+
+async def test_invalid_cursor(db):
+    result = await Service(DbHelper(Article)).get_items_by_cursor("not-a-cursor", 10)
+    assert result["code"] == 400
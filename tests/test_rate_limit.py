@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from src.core.rate_limit import MemoryRateLimitBackend, RateLimiter, client_ip
+from src.core.settings import settings
+from src.modules.user.models import User
+from src.modules.user.schemas.user import UserLogin
+from src.modules.user.user_service import UserService
+
+pytestmark = pytest.mark.anyio
+
+
+def scope(forwarded: str = None) -> dict:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return {"type": "http", "headers": headers, "client": ("10.0.0.2", 5000)}
+
+
+def test_client_ip_uses_address_appended_by_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(settings.rate_limit, "trust_forwarded", True)
+    # 最左侧的地址由客户端伪造
+    assert client_ip(scope("1.1.1.1, 203.0.113.7")) == "203.0.113.7"
+    assert client_ip(scope()) == "10.0.0.2"
+
+    monkeypatch.setattr(settings.rate_limit, "forwarded_hops", 2)
+    assert client_ip(scope("1.1.1.1, 203.0.113.7, 10.0.0.1")) == "203.0.113.7"
+    assert client_ip(scope("203.0.113.7")) == "10.0.0.2"
+
+
+def test_client_ip_ignores_forwarded_header_by_default():
+    assert client_ip(scope("1.1.1.1")) == "10.0.0.2"
+
+
+class SlowPasswordManager:
+    """记录校验次数，校验期间让出事件循环"""
+
+    def __init__(self, result: bool):
+        self.result = result
+        self.verified = 0
+
+    async def verify_password(self, plain: str, hashed: str) -> bool:
+        self.verified += 1
+        await asyncio.sleep(0.01)
+        return self.result
+
+
+async def test_concurrent_logins_cannot_exceed_limit(db):
+    await User.create(username="alice", password="x")
+    password_manager = SlowPasswordManager(result=False)
+    limiter = RateLimiter(MemoryRateLimitBackend(), "login", limit=3, window=60)
+    service = UserService(password_manager, None, limiter)
+
+    login = UserLogin(username="alice", password="wrong")
+    results = await asyncio.gather(*(service.authenticate_user(login) for _ in range(10)))
+
+    # 校验前已占用计数，并发请求中最多 limit 个进入密码校验
+    assert password_manager.verified == 3
+    assert sum(result.status_code == 429 for result in results) == 7
+
+
+async def test_successful_login_resets_attempts(db):
+    await User.create(username="alice", password="x")
+    limiter = RateLimiter(MemoryRateLimitBackend(), "login", limit=2, window=60)
+
+    class Tokens:
+        def create_access_token(self, data):
+            return "access"
+
+        create_refresh_token = create_access_token
+
+    login = UserLogin(username="alice", password="secret")
+    for _ in range(3):
+        result = await UserService(SlowPasswordManager(result=True), Tokens(), limiter).authenticate_user(login)
+        assert result["access_token"] == "access"
+
+
+async def test_username_case_variants_share_one_budget(db):
+    await User.create(username="alice", password="x")
+    password_manager = SlowPasswordManager(result=False)
+    limiter = RateLimiter(MemoryRateLimitBackend(), "login", limit=3, window=60)
+    service = UserService(password_manager, None, limiter)
+
+    results = [
+        await service.authenticate_user(UserLogin(username=username, password="wrong"))
+        for username in ("alice", "Alice", "ALICE", " alice ", "aLiCe")
+    ]
+    # 大小写和首尾空白不同的用户名命中同一个计数（SQLite 区分大小写，其余变体查不到用户，同样计数）
+    assert [result.status_code for result in results] == [404, 404, 404, 429, 429]
@@ -0,0 +1,118 @@
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePosixPath
+from uuid import UUID
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from src.common.schemas import Response
+from src.core.encoders import default, dumps
+from src.core.interfaces.response import response
+from src.modules.user.models import User
+from src.modules.user.schemas.user import get_user_in_db
+
+pytestmark = pytest.mark.anyio
+
+
+def legacy_response(data=None, code=200, message=None):
+    """改造前的实现：jsonable_encoder + Response 泛型模型 + JSONResponse。"""
+    if message is None:
+        message = "请求成功" if code < 400 else "请求失败"
+    return JSONResponse(
+        status_code=code,
+        content=Response(code=code, data=jsonable_encoder(data), message=message).dict(),
+    )
+
+
+class Color(Enum):
+    RED = "red"
+
+
+class Price(BaseModel):
+    amount: Decimal
+    currency: str = Field("CNY", alias="cur")
+
+
+class Order(BaseModel):
+    id: int
+    created: datetime
+    prices: list[Price]
+    timeout: timedelta
+
+
+ORDER = Order(
+    id=1,
+    created=datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc),
+    prices=[Price(amount=Decimal("2.5")), Price(amount=Decimal("3"), cur="USD")],
+    timeout=timedelta(seconds=5),
+)
+
+CASES = {
+    "None": None,
+    "datetime": datetime(2024, 1, 2, 3, 4, 5),
+    "aware datetime": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=8))),
+    "date": date(2024, 1, 2),
+    "time": time(3, 4, 5),
+    "Decimal int": Decimal("1"),
+    "Decimal float": Decimal("1.50"),
+    "timedelta": timedelta(seconds=5),
+    "large float": 1e20,
+    "small float": 1e-7,
+    "Enum": Color.RED,
+    "Path": PurePosixPath("/tmp/a"),
+    "UUID": UUID("12345678-1234-5678-1234-567812345678"),
+    "set": {"a"},
+    "tuple": (1, "中文"),
+    "bytes": b"raw",
+    "nested dict": {"when": date(2024, 1, 2), "items": [{"price": Decimal("9.90")}], 1: "int key"},
+    "pydantic model": ORDER,
+    "list of models": [ORDER, ORDER],
+    "dict of models": {"order": ORDER},
+}
+
+
+@pytest.mark.parametrize("data", CASES.values(), ids=CASES.keys())
+def test_response_is_byte_identical_to_legacy_helper(data):
+    assert response(data=data, message="成功").body == legacy_response(data=data, message="成功").body
+
+
+@pytest.mark.parametrize("code,message", [(200, None), (404, "认证要求, 无token！"), (500, None)])
+def test_error_response_is_byte_identical_to_legacy_helper(code, message):
+    resp = response(code=code, message=message)
+    assert resp.status_code == code
+    assert resp.body == legacy_response(code=code, message=message).body
+
+
+@pytest.mark.parametrize("data", [
+    timedelta(minutes=1), Decimal("1"), Decimal("2.5"), Price(amount=Decimal("2.5")), Color.RED,
+    PurePosixPath("/tmp/a"), {"a"}, [ORDER],
+], ids=repr)
+def test_dumps_default_matches_jsonable_encoder(data):
+    # CustomJSONResponse 和导出使用的 orjson 路径，转换规则与 jsonable_encoder 相同
+    assert json.loads(dumps({"data": data})) == {"data": jsonable_encoder(data)}
+
+
+def test_default_follows_jsonable_encoder_rules():
+    assert default(timedelta(seconds=1)) == 1.0
+    assert default(Decimal("1")) == 1 and isinstance(default(Decimal("1")), int)
+    assert default(Price(amount=Decimal("2.5"))) == {"amount": "2.5", "cur": "CNY"}
+
+
+def test_response_matches_jsonable_encoder():
+    data = {"timeout": timedelta(seconds=5), "price": Decimal("1"), "order": ORDER, "big": 1e20}
+    body = response(data=data).body
+    assert b'"timeout":5.0' in body and b'"price":1,' in body and b'"big":1e+20' in body
+    assert json.loads(body)["data"] == jsonable_encoder(data)
+
+
+async def test_response_encodes_models(db):
+    user = await User.create(username="bob", password="secret")
+    body = json.loads(response(data=get_user_in_db().model_construct(id=user.id, username="bob")).body)
+    assert body["data"] == {"id": user.id, "username": "bob"}
+    body = json.loads(response(data=[user]).body)
+    assert body["data"][0]["username"] == "bob"
@@ -0,0 +1,69 @@
+import pytest
+from tortoise import Tortoise
+
+from src.core.dbhelper import DbHelper
+from src.core.search import AutoSearchEngine, ContainsSearchEngine, InvertedIndexEngine
+from tests.conftest import MODELS
+from tests.models import Article
+
+pytestmark = pytest.mark.anyio
+
+
+async def search(engine, keyword: str) -> list:
+    filters = await engine.filters(Article, {"title": keyword})
+    return sorted(await Article.filter(**filters).values_list("id", flat=True))
+
+
+async def test_default_engine_uses_contains_without_fulltext_index(db):
+    engine = AutoSearchEngine()
+    assert isinstance(engine.fallback, ContainsSearchEngine)
+    assert await engine.filters(Article, {"title": "数据"}) == {"title__contains": "数据"}
+
+
+async def test_inverted_index_builds_in_background(db):
+    first = await Article.create(title="高性能数据库")
+    engine = InvertedIndexEngine(refresh_interval=0)
+
+    # 首次搜索不等待构建，使用 contains 查询
+    filters = await engine.filters(Article, {"title": "数据库"})
+    assert "id__in" not in filters
+    await engine._tasks[Article]
+
+    filters = await engine.filters(Article, {"title": "数据库"})
+    assert filters["id__in"] == [first.id]
+
+
+async def test_inverted_index_catches_up_with_writes_outside_dbhelper(db):
+    first = await Article.create(title="高性能数据库")
+    engine = InvertedIndexEngine(refresh_interval=0)
+    await engine.build(Article, ["title"])
+
+    # 绕过 DbHelper 的新增和更新，如其他 worker 或 Model.create
+    second = await Article.create(title="数据库索引")
+    first.title = "分布式数据库缓存"
+    await first.save()
+    assert await search(engine, "数据库") == [first.id, second.id]
+    assert await search(engine, "缓存") == [first.id]
+
+    # 经 DbHelper 的写入由监听器增量维护
+    third = await DbHelper(Article).insert(dict(title="缓存队列"))
+    assert await search(engine, "缓存") == [first.id, third.id]
+
+
+@pytest.mark.parametrize("tz", ["Asia/Shanghai", "America/New_York"])
+async def test_inverted_index_refresh_uses_database_timezone(tz):
+    # 与项目配置一致：use_tz=False，modified 按配置时区的本地时间写入
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": MODELS}, use_tz=False, timezone=tz)
+    await Tortoise.generate_schemas()
+    try:
+        article = await Article.create(title="高性能数据库")
+        engine = InvertedIndexEngine()
+        await engine.build(Article, ["title"])
+
+        article.title = "分布式缓存"
+        await article.save()
+        await engine.refresh(Article, force=True)
+        filters = await engine.filters(Article, {"title": "缓存"})
+        assert filters["id__in"] == [article.id]
+    finally:
+        await Tortoise.close_connections()